@@ -0,0 +1,135 @@
+"""
+Point-in-time ("as-of date") streak engine and backtest harness.
+
+iter_asof_snapshots() walks each player's season chronologically once and keeps,
+per stat/threshold, the current consecutive-hit streak, season hits and rolling
+L5/L10/L15/L20 hit counts, updated incrementally in O(1) per game. Before each
+game it emits the state as it stood that morning (state is unchanged on dates
+the player did not play), together with that game's outcome, so one pass costs
+O(games × thresholds) instead of re-running calculate_streaks per date.
+
+run_backtest() aggregates those snapshots into hit rates by stat and streak
+length, to check whether a live streak actually predicted the next game.
+"""
+
+import csv
+from collections import defaultdict
+from typing import Iterator, Optional
+
+from refresh import STAT_COLUMNS, STAT_THRESHOLDS, group_player_games
+
+WINDOWS = (5, 10, 15, 20)
+
+# Streak-length buckets reported by the backtest: (label, min_len, max_len)
+STREAK_BUCKETS = [
+    ("0", 0, 0),
+    ("1", 1, 1),
+    ("2", 2, 2),
+    ("3-4", 3, 4),
+    ("5-6", 5, 6),
+    ("7-9", 7, 9),
+    ("10+", 10, None),
+]
+
+
+def iter_asof_snapshots(player_games: list[dict]) -> Iterator[dict]:
+    """Yield one snapshot per player/game/stat/threshold: pre-game state plus the game's outcome."""
+    for pid, data in group_player_games(player_games).items():
+        games = data["games"][::-1]  # oldest first
+
+        for stat_name, col_name in STAT_COLUMNS.items():
+            thresholds = STAT_THRESHOLDS.get(stat_name, [])
+            n = len(thresholds)
+            streak = [0] * n
+            season_hits = [0] * n
+            window_hits = {w: [0] * n for w in WINDOWS}
+            history: list[list[int]] = []  # per-game hit flags, oldest first
+
+            for games_played, game in enumerate(games):
+                val = game.get(col_name)
+                flags = [1 if (val or 0) >= t else 0 for t in thresholds]
+
+                for i, threshold in enumerate(thresholds):
+                    snapshot = {
+                        "player_id": pid,
+                        "player_name": data["player_name"],
+                        "game_date": game["game_date"],
+                        "stat": stat_name,
+                        "threshold": threshold,
+                        "streak_len": streak[i],
+                        "season_hits": season_hits[i],
+                        "season_games": games_played,
+                        "value": val,
+                        "hit": flags[i],
+                    }
+                    for w in WINDOWS:
+                        snapshot[f"last{w}_hits"] = window_hits[w][i]
+                        snapshot[f"last{w}_games"] = min(w, games_played)
+                    yield snapshot
+
+                # Advance state past this game
+                history.append(flags)
+                for w in WINDOWS:
+                    leaving = history[-w - 1] if len(history) > w else None
+                    counts = window_hits[w]
+                    for i in range(n):
+                        counts[i] += flags[i] - (leaving[i] if leaving else 0)
+                for i in range(n):
+                    season_hits[i] += flags[i]
+                    streak[i] = streak[i] + 1 if flags[i] else 0
+
+
+def streak_bucket(streak_len: int) -> str:
+    """Label of the STREAK_BUCKETS entry containing streak_len."""
+    for label, low, high in STREAK_BUCKETS:
+        if streak_len >= low and (high is None or streak_len <= high):
+            return label
+    return STREAK_BUCKETS[-1][0]
+
+
+def run_backtest(player_games: list[dict], min_games: int = 5, out_path: Optional[str] = None) -> list[dict]:
+    """Hit rate of the next game by stat and pre-game streak length, vs. the pre-game season rate."""
+    totals = defaultdict(lambda: [0, 0, 0.0])  # (stat, bucket) → [samples, hits, sum of season rates]
+    snapshots = 0
+    for snap in iter_asof_snapshots(player_games):
+        if snap["season_games"] < min_games:
+            continue
+        snapshots += 1
+        entry = totals[(snap["stat"], streak_bucket(snap["streak_len"]))]
+        entry[0] += 1
+        entry[1] += snap["hit"]
+        entry[2] += snap["season_hits"] / snap["season_games"]
+
+    bucket_order = {label: i for i, (label, _, _) in enumerate(STREAK_BUCKETS)}
+    stat_order = {stat: i for i, stat in enumerate(STAT_COLUMNS)}
+    rows = []
+    for (stat, bucket), (samples, hits, rate_sum) in sorted(
+        totals.items(), key=lambda kv: (stat_order[kv[0][0]], bucket_order[kv[0][1]])
+    ):
+        hit_rate = hits / samples * 100
+        baseline = rate_sum / samples * 100
+        rows.append({
+            "stat": stat,
+            "streak_bucket": bucket,
+            "samples": samples,
+            "hit_pct": round(hit_rate, 1),
+            "season_pct": round(baseline, 1),
+            "lift_pct": round(hit_rate - baseline, 1),
+        })
+
+    print(f"Backtest: {snapshots} pre-game snapshots (season_games >= {min_games})")
+    print(f"{'stat':<5} {'streak':>6} {'samples':>8} {'hit%':>6} {'season%':>8} {'lift':>6}")
+    for row in rows:
+        print(
+            f"{row['stat']:<5} {row['streak_bucket']:>6} {row['samples']:>8} "
+            f"{row['hit_pct']:6.1f} {row['season_pct']:8.1f} {row['lift_pct']:+6.1f}"
+        )
+
+    if out_path:
+        with open(out_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()) if rows else ["stat"])
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Backtest results written to {out_path}")
+
+    return rows
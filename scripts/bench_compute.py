@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Compute-stage scaling benchmark for calculate_streaks.
+
+Generates a synthetic season of player game logs (or uses the cached `fetch`
+output with --cached), runs calculate_streaks with 1..N worker processes, checks
+that every run is identical to the single-process output, and prints the scaling
+curve.
+
+Usage:
+    python scripts/bench_compute.py [--max-workers 8] [--players 450] [--games 82] [--cached]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+import refresh
+
+TEAM_ABBRS = [
+    "ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DAL", "DEN", "DET", "GSW",
+    "HOU", "IND", "LAC", "LAL", "MEM", "MIA", "MIL", "MIN", "NOP", "NYK",
+    "OKC", "ORL", "PHI", "PHX", "POR", "SAC", "SAS", "TOR", "UTA", "WAS",
+]
+
+
+def synthetic_player_games(players: int = 450, games: int = 82, seed: int = 7) -> list[dict]:
+    """Build player_recent_games-shaped records for a synthetic season.
+
+    Every game day pairs all 30 teams, so game ids, matchups, dates and W/L are
+    consistent across both teams' players (team points = sum of player points).
+    """
+    rnd = random.Random(seed)
+    rosters = {team: [] for team in TEAM_ABBRS}
+    for p in range(players):
+        team = TEAM_ABBRS[p % len(TEAM_ABBRS)]
+        # Per-player scoring profile so thresholds produce realistic streaks
+        rosters[team].append((1_600_000 + p, f"Player {p}", rnd.uniform(0.3, 1.6)))
+
+    records = []
+    game_date = datetime(2025, 10, 21)
+    for day in range(games):
+        game_date += timedelta(days=rnd.choice([1, 2, 2, 3]))
+        teams = TEAM_ABBRS[:]
+        rnd.shuffle(teams)
+        for g in range(0, len(teams), 2):
+            home, away = teams[g], teams[g + 1]
+            game_id = f"00225{day:03d}{g // 2:02d}"
+            lines = {}
+            for team, opponent, is_home in ((home, away, True), (away, home, False)):
+                lines[team] = []
+                for pid, name, scale in rosters[team]:
+                    if rnd.random() < 0.08:
+                        continue  # DNP
+                    lines[team].append({
+                        "player_id": pid,
+                        "player_name": name,
+                        "team_abbr": team,
+                        "game_id": game_id,
+                        "game_date": game_date.strftime("%Y-%m-%d"),
+                        "matchup": f"{team} vs. {opponent}" if is_home else f"{team} @ {opponent}",
+                        "wl": None,
+                        "pts": max(0, int(rnd.gauss(14 * scale, 6))),
+                        "reb": max(0, int(rnd.gauss(5 * scale, 3))),
+                        "ast": max(0, int(rnd.gauss(3.5 * scale, 2.5))),
+                        "fg3m": max(0, int(rnd.gauss(1.5 * scale, 1.3))),
+                        "blk": max(0, int(rnd.gauss(0.6 * scale, 0.8))),
+                        "stl": max(0, int(rnd.gauss(0.9 * scale, 0.9))),
+                        "sport": "NBA",
+                    })
+            home_pts = sum(r["pts"] for r in lines[home])
+            away_pts = sum(r["pts"] for r in lines[away])
+            for team, won in ((home, home_pts >= away_pts), (away, away_pts > home_pts)):
+                for record in lines[team]:
+                    record["wl"] = "W" if won else "L"
+                records.extend(lines[team])
+    return records
+
+
+def timed_run(player_games: list[dict], workers: int, repeat: int) -> tuple[float, list[dict]]:
+    best = float("inf")
+    result = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with redirect_stdout(open(os.devnull, "w")):
+            result = refresh.calculate_streaks(player_games, workers)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--players", type=int, default=450)
+    parser.add_argument("--games", type=int, default=82)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per worker count (best is reported)")
+    parser.add_argument("--cached", action="store_true", help="Use cached player logs from `refresh.py fetch`")
+    args = parser.parse_args()
+
+    if args.cached:
+        player_games = refresh.load_cache("player_games")
+        if player_games is None:
+            print(f"No cached player logs in {refresh.CACHE_DIR}")
+            sys.exit(1)
+    else:
+        player_games = synthetic_player_games(args.players, args.games)
+
+    print(f"{len(player_games)} player game records, {os.cpu_count()} CPUs")
+    baseline_time, baseline = timed_run(player_games, 1, args.repeat)
+    print(f"{'workers':>7} {'seconds':>8} {'speedup':>8} {'identical':>9}")
+    print(f"{1:>7} {baseline_time:8.3f} {1.0:8.2f} {'yes':>9}")
+
+    for workers in range(2, args.max_workers + 1):
+        elapsed, result = timed_run(player_games, workers, args.repeat)
+        identical = "yes" if result == baseline else "NO"
+        print(f"{workers:>7} {elapsed:8.3f} {baseline_time / elapsed:8.2f} {identical:>9}")
+        if result != baseline:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for refresh.py subcommands using `python -X importtime`.
+
+For each subcommand, imports refresh.py plus the heavy dependencies that the
+subcommand loads lazily, and reports the cumulative import time. The "eager"
+row is what every invocation paid when nba_api and supabase were imported at
+module load. `compute` is not free: numpy and pandas dominate its import time,
+and it pays that only because the window streaks, team defense and stat
+distribution outputs need them; status/events/backtest stay light.
+
+Usage:
+    python scripts/bench_startup.py [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules compute_all imports (window_streaks pulls in numpy, team_defense and
+# stat_distributions pull in pandas)
+COMPUTE_IMPORTS = ["split_streaks", "window_streaks", "team_defense", "stat_distributions"]
+
+# Lazily-imported modules reached by each subcommand's code path
+COMMAND_IMPORTS = {
+    "compute": COMPUTE_IMPORTS,
+    "status": ["urllib.request"],
+    "fetch": ["nba_api.stats.endpoints", "log_validation"],
+    "events": ["supabase", "streak_snapshot"],
+    "sync": ["supabase", "streak_snapshot", "urllib.request"],
+    "backtest": ["asof_streaks"],
+    "run": ["nba_api.stats.endpoints", "log_validation", "supabase", "streak_snapshot", "urllib.request"]
+    + COMPUTE_IMPORTS,
+    "eager": ["nba_api.stats.endpoints", "nba_api.stats.static.teams", "supabase"],
+}
+
+
+def measure_import_us(modules: list[str]) -> int:
+    """Return total cumulative import time (µs) for refresh + modules in a fresh interpreter."""
+    code = "; ".join(["import refresh"] + [f"import {m}" for m in modules])
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=SCRIPTS_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in proc.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        name = parts[2]
+        # Only top-level entries (no leading indentation) to avoid double counting
+        if parts[1].strip().isdigit() and not name.startswith("  "):
+            total += int(parts[1])
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per subcommand (median is reported)")
+    args = parser.parse_args()
+
+    results = {}
+    for command, modules in COMMAND_IMPORTS.items():
+        samples = [measure_import_us(modules) for _ in range(args.repeat)]
+        results[command] = statistics.median(samples)
+
+    eager = results["eager"]
+    print(f"{'command':<10} {'import ms':>10} {'vs eager':>9}")
+    for command, us in results.items():
+        print(f"{command:<10} {us / 1000:10.1f} {us / eager:8.0%}")
+
+
+if __name__ == "__main__":
+    main()
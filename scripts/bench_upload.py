@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Upload load harness: drives refresh.py's real write paths against a local
+PostgREST stand-in to measure throughput/latency for chunk size × concurrency.
+
+The stand-in is an in-memory HTTP server that mimics the PostgREST calls the
+supabase client makes:
+  POST   /rest/v1/<table>[?on_conflict=a,b]   insert, or upsert with
+         Prefer: resolution=merge-duplicates | ignore-duplicates
+         (plain inserts that hit an existing on_conflict key → 409)
+  DELETE /rest/v1/<table>?col=eq.value
+  GET    /rest/v1/<table>?col=eq.value[&order=col.desc&limit=n]
+         (Prefer: count=exact → Content-Range total)
+with a configurable per-request latency and request body limit (→ 413).
+
+For every (path, rows, chunk size, concurrency) cell it reports wall time, rows/s,
+request-body MB/s and server-observed p50/p99 request latency.
+
+Usage:
+    python scripts/bench_upload.py [--latency-ms 40] [--max-body-kb 2048]
+        [--rows 5000,30000] [--chunks 100,250,500,1000,2000] [--concurrency 1,2,4,8]
+        [--path upsert|events|both]
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+import refresh
+from bench_compute import synthetic_player_games
+
+
+class PostgrestStandIn:
+    """In-memory table store plus request log shared by the handler threads."""
+
+    def __init__(self, latency_ms: float, max_body_bytes: int):
+        self.latency = latency_ms / 1000
+        self.max_body_bytes = max_body_bytes
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.tables: dict[str, dict] = {}
+            self.next_id = 1
+            self.requests: list[tuple[str, int, float, int]] = []  # (method, body bytes, seconds, status)
+
+    def log(self, method: str, body_bytes: int, seconds: float, status: int):
+        with self.lock:
+            self.requests.append((method, body_bytes, seconds, status))
+
+    def write(self, table: str, rows: list[dict], conflict_cols: list[str], resolution: str) -> tuple[int, list[dict]]:
+        """Apply an insert/upsert atomically. Returns (status, written rows)."""
+        with self.lock:
+            store = self.tables.setdefault(table, {})
+            cols = conflict_cols or ["id"]
+            staged = {}
+            for row in rows:
+                row = dict(row)
+                if cols == ["id"] and "id" not in row:
+                    row["id"] = self.next_id
+                    self.next_id += 1
+                key = tuple(row.get(c) for c in cols)
+                exists = key in store or key in staged
+                if exists and resolution == "ignore-duplicates":
+                    continue
+                if exists and resolution != "merge-duplicates":
+                    return 409, []
+                if exists:
+                    row = {**(staged.get(key) or store[key]), **row}
+                staged[key] = row
+            store.update(staged)
+            return 201, list(staged.values())
+
+    def select(self, table: str, filters: dict[str, str], delete: bool = False) -> list[dict]:
+        with self.lock:
+            store = self.tables.setdefault(table, {})
+            matched = [
+                key for key, row in store.items()
+                if all(str(row.get(col)) == value for col, value in filters.items())
+            ]
+            rows = [store[key] for key in matched]
+            if delete:
+                for key in matched:
+                    del store[key]
+            return rows
+
+
+def make_handler(state: PostgrestStandIn):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _parse(self) -> tuple[str, dict[str, str], list[str]]:
+            url = urlparse(self.path)
+            table = url.path.rsplit("/", 1)[-1]
+            query = parse_qs(url.query)
+            conflict_cols = query.pop("on_conflict", [""])[0].split(",") if "on_conflict" in query else []
+            filters = {
+                col: values[0][3:] for col, values in query.items()
+                if col != "select" and values[0].startswith("eq.")
+            }
+            return table, filters, [c for c in conflict_cols if c]
+
+        def _respond(self, status: int, payload, started: float, body_bytes: int, total: Optional[int] = None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if total is not None:
+                self.send_header("Content-Range", f"0-{max(len(payload) - 1, 0)}/{total}")
+            self.end_headers()
+            self.wfile.write(body)
+            state.log(self.command, body_bytes, time.perf_counter() - started, status)
+
+        def do_POST(self):
+            started = time.perf_counter()
+            length = int(self.headers.get("Content-Length", 0))
+            raw = self.rfile.read(length)
+            time.sleep(state.latency)
+            if length > state.max_body_bytes:
+                self._respond(413, {"message": "Payload too large"}, started, length)
+                return
+            table, _, conflict_cols = self._parse()
+            prefer = self.headers.get("Prefer", "")
+            resolution = next(
+                (p.split("=", 1)[1] for p in prefer.split(",") if p.strip().startswith("resolution=")), ""
+            )
+            rows = json.loads(raw)
+            rows = rows if isinstance(rows, list) else [rows]
+            status, written = state.write(table, rows, conflict_cols, resolution.strip())
+            if status == 409:
+                self._respond(409, {"code": "23505", "message": "duplicate key value"}, started, length)
+            else:
+                self._respond(status, written, started, length)
+
+        def do_DELETE(self):
+            started = time.perf_counter()
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(state.latency)
+            table, filters, _ = self._parse()
+            self._respond(200, state.select(table, filters, delete=True), started, 0)
+
+        def do_GET(self):
+            started = time.perf_counter()
+            time.sleep(state.latency)
+            table, filters, _ = self._parse()
+            rows = state.select(table, filters)
+            total = len(rows)
+            query = parse_qs(urlparse(self.path).query)
+            if "order" in query:
+                col, _, direction = query["order"][0].partition(".")
+                rows = sorted(rows, key=lambda r: str(r.get(col)), reverse=direction.startswith("desc"))
+            if "limit" in query:
+                rows = rows[:int(query["limit"][0])]
+            counted = "count=exact" in self.headers.get("Prefer", "")
+            self._respond(200, rows, started, 0, total if counted else None)
+
+    return Handler
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def synthetic_events(rows: int) -> list[dict]:
+    """streak_events-shaped records (one 'extended' event per synthetic player game)."""
+    return [
+        {
+            "player_id": g["player_id"],
+            "player_name": g["player_name"],
+            "team_abbr": g["team_abbr"],
+            "stat": "PTS",
+            "threshold": 10 + i % 9 * 5,
+            "event_type": "extended",
+            "prev_streak_len": i % 7,
+            "new_streak_len": i % 7 + 1,
+            "last_game": g["game_date"],
+            "entity_type": "player",
+            "sport": "NBA",
+        }
+        for i, g in enumerate(synthetic_player_games()[:rows])
+    ]
+
+
+def run_cell(state: PostgrestStandIn, client, path: str, source: list[dict], rows: int, chunk: int, concurrency: int) -> dict:
+    state.reset()
+    data = [dict(r) for r in source[:rows]]
+    error = None
+    started = time.perf_counter()
+    try:
+        with redirect_stdout(open(os.devnull, "w")):
+            if path == "upsert":
+                refresh.upsert_data(
+                    client, "player_recent_games", data, ["player_id", "game_id"],
+                    chunk_size=chunk, concurrency=concurrency,
+                )
+            else:
+                refresh.insert_streak_events(client, data, chunk_size=chunk, concurrency=concurrency)
+    except Exception as e:
+        error = type(e).__name__
+    elapsed = time.perf_counter() - started
+
+    latencies = [seconds for _, _, seconds, _ in state.requests]
+    statuses = [status for _, _, _, status in state.requests]
+    body_bytes = sum(b for _, b, _, _ in state.requests)
+    if error is None and any(s >= 400 for s in statuses):
+        error = f"HTTP {max(statuses)}"
+    return {
+        "path": path,
+        "rows": len(data),
+        "chunk": chunk,
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "rows_per_s": len(data) / elapsed if not error else 0.0,
+        "mb_per_s": body_bytes / elapsed / 1e6,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "requests": len(latencies),
+        "error": error or "",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="Added latency per request")
+    parser.add_argument("--max-body-kb", type=int, default=2048, help="Request body limit (larger → 413)")
+    parser.add_argument("--rows", default="5000,30000")
+    parser.add_argument("--chunks", default="100,250,500,1000,2000")
+    parser.add_argument("--concurrency", default="1,2,4,8")
+    parser.add_argument("--path", choices=["upsert", "events", "both"], default="both")
+    args = parser.parse_args()
+
+    state = PostgrestStandIn(args.latency_ms, args.max_body_kb * 1024)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    from supabase import create_client
+
+    client = create_client(f"http://127.0.0.1:{server.server_port}", "local-bench-key")
+
+    row_counts = [int(x) for x in args.rows.split(",")]
+    paths = ["upsert", "events"] if args.path == "both" else [args.path]
+    sources = {}
+    if "upsert" in paths:
+        sources["upsert"] = synthetic_player_games()
+    if "events" in paths:
+        sources["events"] = synthetic_events(max(row_counts))
+
+    print(f"Stand-in PostgREST: latency {args.latency_ms:.0f} ms/request, body limit {args.max_body_kb} KiB")
+    print(f"{'path':<7} {'rows':>6} {'chunk':>6} {'conc':>4} {'sec':>7} {'rows/s':>9} {'MB/s':>6} "
+          f"{'p50 ms':>7} {'p99 ms':>7} {'reqs':>5}  error")
+    try:
+        for path in paths:
+            for rows in row_counts:
+                for chunk in [int(x) for x in args.chunks.split(",")]:
+                    for concurrency in [int(x) for x in args.concurrency.split(",")]:
+                        r = run_cell(state, client, path, sources[path], rows, chunk, concurrency)
+                        print(f"{r['path']:<7} {r['rows']:>6} {r['chunk']:>6} {r['concurrency']:>4} "
+                              f"{r['seconds']:7.2f} {r['rows_per_s']:9.0f} {r['mb_per_s']:6.2f} "
+                              f"{r['p50_ms']:7.1f} {r['p99_ms']:7.1f} {r['requests']:>5}  {r['error']}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
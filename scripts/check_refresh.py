@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Offline consistency checks for refresh.py: no network, no Supabase.
+
+Each check feeds a fixed, real-shaped input through the code refresh.py runs in
+production and asserts on the result; failures raise AssertionError.
+
+Usage:
+    python scripts/check_refresh.py
+"""
+
+import os
+import sys
+from contextlib import redirect_stdout
+
+import refresh
+
+
+def check_scoreboard_opponents():
+    """A GameHeader frame (team ids only) yields abbreviations and opp split rows."""
+    import pandas as pd
+    from nba_api.stats.endpoints import ScoreboardV2
+
+    from split_streaks import calculate_split_streaks, get_tonights_opponents
+
+    metadata = refresh.get_team_metadata()
+    columns = ScoreboardV2.expected_data["GameHeader"]
+    assert "HOME_TEAM_ABBREVIATION" not in columns
+    row = dict.fromkeys(columns)
+    row.update({
+        "GAME_DATE_EST": "2026-01-15T00:00:00",
+        "GAME_ID": "0022600601",
+        "GAME_STATUS_TEXT": "7:30 pm ET",
+        "HOME_TEAM_ID": metadata["BOS"]["id"],
+        "VISITOR_TEAM_ID": metadata["LAL"]["id"],
+    })
+    games = refresh.parse_scoreboard_games(pd.DataFrame([row], columns=columns))
+    assert games[0]["home_team_abbr"] == "BOS" and games[0]["away_team_abbr"] == "LAL", games
+    assert get_tonights_opponents(games) == {"BOS": "LAL", "LAL": "BOS"}
+
+    player_games = [
+        {
+            "player_id": 1, "player_name": "Test Player", "team_abbr": "BOS",
+            "game_id": f"00225000{i:02d}", "game_date": f"2026-01-{14 - i:02d}",
+            "matchup": "BOS vs. LAL" if i % 2 else "BOS @ NYK",
+            "pts": 30, "reb": 10, "ast": 10, "fg3m": 3, "blk": 2, "stl": 2,
+        }
+        for i in range(10)
+    ]
+    with redirect_stdout(open(os.devnull, "w")):
+        rows = calculate_split_streaks(player_games, games)
+    assert any(r["split_type"] == "opp" and r["split_value"] == "LAL" for r in rows)
+
+
+def check_streak_event_key():
+    """streak_event_key matches the add_streak_event_key backfill, including a null entity."""
+    import hashlib
+
+    # (event, concat_ws('|', ...) input the SQL backfill hashes for that row, pinned digest)
+    samples = [
+        (
+            {
+                "sport": "NBA", "entity_type": "player", "player_id": 201939, "team_abbr": "GSW",
+                "stat": "PTS", "threshold": 25.0, "streak_type": "consecutive",
+                "event_type": "extended", "new_streak_len": 5, "last_game": "2026-01-14",
+            },
+            "NBA|player|201939|PTS|25|consecutive|extended|5|2026-01-14",
+            "cc64c8e698bfafac9cee885106e1c782044104daf07197993cab81b7367060f4",
+        ),
+        (
+            {
+                "sport": "NBA", "entity_type": "team", "player_id": None, "team_abbr": None,
+                "stat": "ML", "threshold": 1, "streak_type": "consecutive",
+                "event_type": "broke", "new_streak_len": None, "last_game": None,
+            },
+            "NBA|team||ML|1|consecutive|broke|0|",
+            "620c125f7cbe454e9194a1b239da76b9421725b93bd8fdc21f85790917f0ed51",
+        ),
+    ]
+    for event, sql_input, digest in samples:
+        assert hashlib.sha256(sql_input.encode("utf-8")).hexdigest() == digest, sql_input
+        assert refresh.streak_event_key(event) == digest, event
+
+
+CHECKS = [
+    check_scoreboard_opponents,
+    check_streak_event_key,
+]
+
+
+def main():
+    failed = 0
+    for check in CHECKS:
+        try:
+            check()
+            print(f"ok    {check.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL  {check.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
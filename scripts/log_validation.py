@@ -0,0 +1,165 @@
+"""
+Columnar validation and quarantine for fetched nba_api game log frames.
+
+validate_game_logs() runs every check as a vectorized pass over the raw
+PlayerGameLogs / TeamGameLogs DataFrame:
+  - schema types   ids, dates and stat columns must parse to the expected type
+  - missing values required stat columns must be present
+  - value ranges   stats must fall inside LOG_SPECS ranges
+  - duplicate keys repeated (entity, GAME_ID) rows keep the first occurrence
+  - team/game      MATCHUP must start with the row's team, and every row of a
+                   GAME_ID must agree on the two teams and the game date
+  - freshness      most recent GAME_DATE (reported, never quarantines)
+
+Bad rows are dropped from the frame and written to a JSONL quarantine file with
+their reason, so a single bad row cannot fail an upsert chunk downstream. The
+summary lists the (team, GAME_ID) pairs that lost a row (except to duplicate_key,
+where the kept first row still counts), since anything aggregated per team game
+from the clean rows is incomplete there.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+GAME_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+# Data older than this (days) is reported as stale (warning only)
+MAX_DATA_AGE_DAYS = 2
+
+LOG_SPECS = {
+    "player": {
+        "key": ["PLAYER_ID", "GAME_ID"],
+        "id_columns": ["PLAYER_ID", "TEAM_ID"],
+        "ranges": {
+            "PTS": (0, 100),
+            "REB": (0, 40),
+            "AST": (0, 30),
+            "FG3M": (0, 20),
+            "BLK": (0, 20),
+            "STL": (0, 15),
+        },
+    },
+    "team": {
+        "key": ["TEAM_ID", "GAME_ID"],
+        "id_columns": ["TEAM_ID"],
+        "ranges": {
+            "PTS": (30, 200),
+        },
+    },
+}
+
+
+def _flag(reasons: pd.Series, mask: pd.Series, reason: str) -> None:
+    """Record `reason` for rows in mask that have not been flagged yet (first reason wins)."""
+    reasons[mask & reasons.isna()] = reason
+
+
+def _game_mode(values: pd.Series, game_ids: pd.Series) -> pd.Series:
+    """Most common value of `values` within each GAME_ID, broadcast back to rows."""
+    counts = pd.DataFrame({"game_id": game_ids, "value": values}).value_counts(sort=True)
+    mode = counts.reset_index().drop_duplicates("game_id").set_index("game_id")["value"]
+    return game_ids.map(mode)
+
+
+def validate_game_logs(df: pd.DataFrame, entity_type: str, quarantine_dir: str) -> tuple[pd.DataFrame, dict]:
+    """Return (clean frame, summary). Quarantined rows are written under quarantine_dir."""
+    spec = LOG_SPECS[entity_type]
+    df = df.reset_index(drop=True)
+    reasons = pd.Series(pd.NA, index=df.index, dtype="object")
+
+    # Schema types
+    for col in spec["id_columns"]:
+        parsed = pd.to_numeric(df[col], errors="coerce")
+        _flag(reasons, parsed.isna(), f"bad_type:{col}")
+    game_dates = pd.to_datetime(df["GAME_DATE"], format=GAME_DATE_FORMAT, errors="coerce")
+    _flag(reasons, game_dates.isna(), "bad_type:GAME_DATE")
+    _flag(reasons, df["GAME_ID"].isna() | (df["GAME_ID"].astype(str).str.strip() == ""), "bad_type:GAME_ID")
+
+    # Missing values and value ranges
+    for col, (low, high) in spec["ranges"].items():
+        values = pd.to_numeric(df[col], errors="coerce")
+        _flag(reasons, df[col].notna() & values.isna(), f"bad_type:{col}")
+        _flag(reasons, values.isna(), f"missing:{col}")
+        _flag(reasons, (values < low) | (values > high), f"out_of_range:{col}")
+
+    # Duplicate keys (keep the first occurrence)
+    _flag(reasons, df.duplicated(spec["key"], keep="first"), "duplicate_key")
+
+    # Team / game consistency via the parsed matchup
+    matchup = df["MATCHUP"].fillna("").astype(str)
+    parts = matchup.str.extract(r"^(?P<team>\S+) (?:vs\.|@) (?P<opp>\S+)$")
+    _flag(reasons, parts["team"].isna(), "bad_matchup")
+    _flag(reasons, parts["team"].notna() & (parts["team"] != df["TEAM_ABBREVIATION"]), "team_matchup_mismatch")
+
+    pair = parts["team"].where(parts["team"] < parts["opp"], parts["opp"]) + "-" + \
+        parts["opp"].where(parts["team"] < parts["opp"], parts["team"])
+    game_ids = df["GAME_ID"].astype(str)
+    valid_pair = pair.notna()
+    game_pair = _game_mode(pair[valid_pair], game_ids[valid_pair]).reindex(df.index)
+    _flag(reasons, valid_pair & (pair != game_pair), "team_game_mismatch")
+    valid_date = game_dates.notna()
+    game_date = _game_mode(game_dates[valid_date], game_ids[valid_date]).reindex(df.index)
+    _flag(reasons, valid_date & (game_dates != game_date), "date_game_mismatch")
+
+    bad = reasons.notna()
+    clean = df[~bad]
+    quarantined = df[bad].assign(QUARANTINE_REASON=reasons[bad])
+
+    # Freshness (over the clean rows only)
+    max_date = game_dates[~bad].max()
+    days_old = (datetime.now() - max_date.to_pydatetime()).days if pd.notna(max_date) else None
+
+    summary = {
+        "entity_type": entity_type,
+        "rows_in": int(len(df)),
+        "rows_clean": int(len(clean)),
+        "rows_quarantined": int(bad.sum()),
+        "reasons": {k: int(v) for k, v in reasons[bad].value_counts().items()},
+        "max_game_date": max_date.strftime("%Y-%m-%d") if pd.notna(max_date) else None,
+        "days_old": days_old,
+        "fresh": days_old is not None and days_old <= MAX_DATA_AGE_DAYS,
+        "quarantine_file": None,
+        "quarantined_team_games": sorted(
+            {
+                (str(team), str(game_id))
+                for team, game_id, reason in zip(
+                    quarantined["TEAM_ABBREVIATION"], quarantined["GAME_ID"], quarantined["QUARANTINE_REASON"]
+                )
+                if reason != "duplicate_key" and pd.notna(team) and pd.notna(game_id)
+            }
+        ),
+    }
+
+    os.makedirs(quarantine_dir, exist_ok=True)
+    if len(quarantined):
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(quarantine_dir, f"{entity_type}_logs_{stamp}.jsonl")
+        quarantined.to_json(path, orient="records", lines=True, date_format="iso")
+        summary["quarantine_file"] = path
+
+    print_summary(summary)
+    with open(os.path.join(quarantine_dir, f"{entity_type}_summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+
+    return clean, summary
+
+
+def print_summary(summary: dict) -> None:
+    """Print the quarantine and freshness lines for a validation summary."""
+    entity_type = summary["entity_type"]
+    if summary["rows_quarantined"]:
+        reasons = ", ".join(f"{k}={v}" for k, v in sorted(summary["reasons"].items()))
+        print(f"  WARNING: quarantined {summary['rows_quarantined']}/{summary['rows_in']} {entity_type} rows ({reasons})")
+        print(f"  Quarantine file: {summary['quarantine_file']}")
+    else:
+        print(f"  Validation OK: {summary['rows_in']} {entity_type} rows, none quarantined")
+
+    if summary["max_game_date"] is None:
+        print(f"  WARNING: no valid {entity_type} rows to check freshness")
+    elif summary["fresh"]:
+        print(f"  Data freshness OK: most recent {entity_type} game is {summary['max_game_date']}")
+    else:
+        print(f"  WARNING: {entity_type} data is {summary['days_old']} days old (max date: {summary['max_game_date']})")
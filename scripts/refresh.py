@@ -2,25 +2,39 @@
 """
 NBA Data Refresh Script for GitHub Actions
 Fetches player stats, team stats, and game data from nba_api and upserts to Supabase.
+
+Subcommands (default: run):
+  run      full pipeline (fetch → sync logs → compute → events → sync streaks)
+  fetch    fetch games/logs from nba_api into the local cache
+  compute  compute streaks from cached logs (no network)
+  events   detect and insert streak events for cached streaks
+  sync     upsert cached games/logs/streaks to Supabase
+  status   show local cache and remote refresh_status
+  backtest replay cached logs as-of each game date and report streak hit rates
+
+nba_api and the supabase client are imported lazily so that compute/status
+do not pay their import cost.
 """
 
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
+import json
 import os
 import sys
 from datetime import datetime, timezone
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 import time
 from urllib.error import URLError
 from http.client import HTTPException
 
-from nba_api.stats.endpoints import (
-    ScoreboardV2,
-    PlayerGameLogs,
-    TeamGameLogs,
-)
-from nba_api.stats.static import teams
-from supabase import create_client, Client
+if TYPE_CHECKING:
+    from supabase import Client
 
 from postseason_teams import get_postseason_teams, POSTSEASON_MODE
+from stage_profiler import StageProfiler
 
 # Configuration - Player stat thresholds
 STAT_COLUMNS = {
@@ -55,6 +69,27 @@ MAX_RETRIES = 3
 BASE_TIMEOUT = 60
 ALLOWED_EVENT_TYPES = {"extended", "broke"}
 
+# Write batching (tune with scripts/bench_upload.py)
+UPSERT_CHUNK_SIZE = 500
+EVENT_CHUNK_SIZE = 200
+WRITE_CONCURRENCY = 1
+
+# Local cache for subcommand hand-off (fetch → compute → events → sync)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get("REFRESH_CACHE_DIR", os.path.join(REPO_ROOT, ".cache", "refresh"))
+QUARANTINE_DIR = os.path.join(CACHE_DIR, "quarantine")
+# Streaks written by the last sync, diffed by detect_streak_events (see streak_snapshot)
+SNAPSHOT_PATH = os.path.join(CACHE_DIR, "streak_snapshot.bin")
+
+# Computed outputs that replace their NBA rows on every sync (cache name → table).
+# "streaks" also drives streak event detection.
+COMPUTED_TABLES = {
+    "streaks": "streaks",
+    "split_streaks": "player_split_streaks",
+    "team_defense": "team_defense_allowed",
+    "stat_distributions": "player_stat_distributions",
+}
+
 
 def get_season_start_date() -> datetime:
     """Get the start date of the current NBA season (Oct 21)."""
@@ -78,6 +113,8 @@ def get_season_string() -> str:
 
 def get_supabase_client() -> Client:
     """Initialize Supabase client from environment variables."""
+    from supabase import create_client
+    
     url = os.environ.get("SUPABASE_URL")
     key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
     
@@ -88,39 +125,89 @@ def get_supabase_client() -> Client:
     return create_client(url, key)
 
 
+def load_cache(name: str):
+    """Load a JSON artifact from the local refresh cache (None if missing)."""
+    path = os.path.join(CACHE_DIR, f"{name}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_cache(name: str, data) -> None:
+    """Write a JSON artifact to the local refresh cache."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, f"{name}.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+@functools.lru_cache(maxsize=1)
+def get_team_metadata() -> dict[str, dict]:
+    """Map team abbreviation → {id, full_name}. Cached on disk after the first nba_api lookup."""
+    cached = load_cache("nba_team_metadata")
+    if cached:
+        return cached
+    
+    from nba_api.stats.static import teams
+    
+    metadata = {t["abbreviation"]: {"id": t["id"], "full_name": t["full_name"]} for t in teams.get_teams()}
+    save_cache("nba_team_metadata", metadata)
+    return metadata
+
+
+def get_team_names() -> dict[str, str]:
+    """Map team abbreviation → full name."""
+    return {abbr: meta["full_name"] for abbr, meta in get_team_metadata().items()}
+
+
+def parse_scoreboard_games(games_df) -> list[dict]:
+    """games_today rows from a ScoreboardV2 GameHeader frame.
+    
+    GameHeader only carries HOME_TEAM_ID / VISITOR_TEAM_ID, so abbreviations come
+    from the static team metadata.
+    """
+    team_abbrs = {meta["id"]: abbr for abbr, meta in get_team_metadata().items()}
+    
+    games = []
+    for _, row in games_df.iterrows():
+        game_id = str(row["GAME_ID"])
+        
+        # Parse game time
+        game_date_str = row.get("GAME_DATE_EST", "")
+        if game_date_str:
+            game_date = datetime.strptime(game_date_str[:10], "%Y-%m-%d").strftime("%Y-%m-%d")
+        else:
+            game_date = datetime.now().strftime("%Y-%m-%d")
+        
+        # Get status
+        status = row.get("GAME_STATUS_TEXT", "")
+        
+        games.append({
+            "id": game_id,
+            "home_team_abbr": team_abbrs.get(int(row["HOME_TEAM_ID"])),
+            "away_team_abbr": team_abbrs.get(int(row["VISITOR_TEAM_ID"])),
+            "home_score": int(row["HOME_TEAM_PTS"]) if row.get("HOME_TEAM_PTS") else None,
+            "away_score": int(row["VISITOR_TEAM_PTS"]) if row.get("VISITOR_TEAM_PTS") else None,
+            "status": status,
+            "game_date": game_date,
+            "game_time": status if "ET" in str(status) else None,
+            "sport": "NBA",
+        })
+    return games
+
+
 def fetch_todays_games() -> list[dict]:
     """Fetch today's NBA scoreboard."""
+    from nba_api.stats.endpoints import ScoreboardV2
+    
     print("Fetching today's games...")
     
     try:
         scoreboard = ScoreboardV2()
-        games_df = scoreboard.get_data_frames()[0]
-        
-        games = []
-        for _, row in games_df.iterrows():
-            game_id = str(row["GAME_ID"])
-            
-            # Parse game time
-            game_date_str = row.get("GAME_DATE_EST", "")
-            if game_date_str:
-                game_date = datetime.strptime(game_date_str[:10], "%Y-%m-%d").strftime("%Y-%m-%d")
-            else:
-                game_date = datetime.now().strftime("%Y-%m-%d")
-            
-            # Get status
-            status = row.get("GAME_STATUS_TEXT", "")
-            
-            games.append({
-                "id": game_id,
-                "home_team_abbr": row.get("HOME_TEAM_ABBREVIATION"),
-                "away_team_abbr": row.get("VISITOR_TEAM_ABBREVIATION"),
-                "home_score": int(row["HOME_TEAM_PTS"]) if row.get("HOME_TEAM_PTS") else None,
-                "away_score": int(row["VISITOR_TEAM_PTS"]) if row.get("VISITOR_TEAM_PTS") else None,
-                "status": status,
-                "game_date": game_date,
-                "game_time": status if "ET" in str(status) else None,
-                "sport": "NBA",
-            })
+        games = parse_scoreboard_games(scoreboard.get_data_frames()[0])
         
         print(f"Found {len(games)} games today")
         return games
@@ -130,8 +217,15 @@ def fetch_todays_games() -> list[dict]:
         return []
 
 
-def fetch_player_game_logs() -> list[dict]:
-    """Fetch player game logs for the entire season with retry logic."""
+def fetch_player_game_logs() -> tuple[list[dict], set[tuple[str, str]]]:
+    """Fetch player game logs for the entire season with retry logic.
+    
+    Returns (games, quarantined team games): the (team_abbr, game_id) pairs that
+    lost a player row to validation, so their derived team totals are incomplete.
+    """
+    from nba_api.stats.endpoints import PlayerGameLogs
+    from log_validation import validate_game_logs
+    
     season_start = get_season_start_date()
     season = get_season_string()
     now = datetime.now()
@@ -161,11 +255,15 @@ def fetch_player_game_logs() -> list[dict]:
                 raise ValueError("PlayerGameLogs returned empty dataframe")
             
             # Verify expected columns exist
-            required_cols = ["PLAYER_ID", "PLAYER_NAME", "GAME_DATE", "GAME_ID"]
+            required_cols = ["PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "TEAM_ABBREVIATION", "GAME_DATE", "GAME_ID", "MATCHUP"]
             missing = [c for c in required_cols if c not in df.columns]
             if missing:
                 raise ValueError(f"Missing expected columns: {missing}")
             
+            # Drop and quarantine rows that would break downstream upserts
+            df, summary = validate_game_logs(df, "player", QUARANTINE_DIR)
+            quarantined_team_games = {tuple(key) for key in summary["quarantined_team_games"]}
+            
             games = []
             for _, row in df.iterrows():
                 game_date = datetime.strptime(row["GAME_DATE"], "%Y-%m-%dT%H:%M:%S").strftime("%Y-%m-%d")
@@ -188,7 +286,7 @@ def fetch_player_game_logs() -> list[dict]:
                 })
             
             print(f"  Found {len(games)} player game records")
-            return games  # Success!
+            return games, quarantined_team_games  # Success!
             
         except (URLError, HTTPException, TimeoutError, ValueError) as e:
             last_error = e
@@ -204,6 +302,9 @@ def fetch_player_game_logs() -> list[dict]:
 
 def fetch_team_game_logs() -> list[dict]:
     """Fetch team game logs for the entire season with retry logic."""
+    from nba_api.stats.endpoints import TeamGameLogs
+    from log_validation import validate_game_logs
+    
     season_start = get_season_start_date()
     season = get_season_string()
     now = datetime.now()
@@ -233,11 +334,14 @@ def fetch_team_game_logs() -> list[dict]:
                 raise ValueError("TeamGameLogs returned empty dataframe")
             
             # Verify expected columns exist
-            required_cols = ["TEAM_ID", "TEAM_ABBREVIATION", "GAME_DATE", "GAME_ID"]
+            required_cols = ["TEAM_ID", "TEAM_ABBREVIATION", "GAME_DATE", "GAME_ID", "MATCHUP"]
             missing = [c for c in required_cols if c not in df.columns]
             if missing:
                 raise ValueError(f"Missing expected columns: {missing}")
             
+            # Drop and quarantine rows that would break downstream upserts
+            df, _ = validate_game_logs(df, "team", QUARANTINE_DIR)
+            
             games = []
             for _, row in df.iterrows():
                 game_date = datetime.strptime(row["GAME_DATE"], "%Y-%m-%dT%H:%M:%S").strftime("%Y-%m-%d")
@@ -268,11 +372,19 @@ def fetch_team_game_logs() -> list[dict]:
     raise RuntimeError(f"Failed to fetch team logs after {MAX_RETRIES} attempts: {last_error}")
 
 
-def calculate_streaks(player_games: list[dict]) -> list[dict]:
-    """Calculate player streaks for each player/stat/threshold combination."""
-    print("Calculating player streaks...")
-    
-    # Group games by player
+def parse_matchup(matchup: Optional[str]) -> tuple[Optional[bool], Optional[str]]:
+    """Parse "BOS vs. NYK" (home) / "BOS @ NYK" (away) into (is_home, opponent_abbr)."""
+    if not matchup:
+        return None, None
+    if " vs. " in matchup:
+        return True, matchup.split(" vs. ", 1)[1].strip()
+    if " @ " in matchup:
+        return False, matchup.split(" @ ", 1)[1].strip()
+    return None, None
+
+
+def group_player_games(player_games: list[dict]) -> dict[int, dict]:
+    """Group games by player: pid → {player_name, team_abbr, games (most recent first)}."""
     player_data = {}
     for game in player_games:
         pid = game["player_id"]
@@ -288,86 +400,230 @@ def calculate_streaks(player_games: list[dict]) -> list[dict]:
     for pid in player_data:
         player_data[pid]["games"].sort(key=lambda g: g["game_date"], reverse=True)
     
+    return player_data
+
+
+def derive_team_game_logs(player_games: list[dict]) -> list[dict]:
+    """Build team_recent_games records from player logs (team PTS = sum of player PTS per game)."""
+    import pandas as pd
+    
+    print("Deriving team game logs from player logs...")
+    if not player_games:
+        return []
+    
+    df = pd.DataFrame.from_records(
+        player_games,
+        columns=["team_abbr", "game_id", "game_date", "matchup", "wl", "pts"],
+    )
+    team_df = (
+        df.groupby(["team_abbr", "game_id"], sort=False)
+        .agg(
+            game_date=("game_date", "first"),
+            matchup=("matchup", "first"),
+            wl=("wl", "first"),
+            pts=("pts", "sum"),
+        )
+        .reset_index()
+    )
+    
+    team_ids = {abbr: meta["id"] for abbr, meta in get_team_metadata().items()}
+    team_df["team_id"] = team_df["team_abbr"].map(team_ids)
+    unknown = team_df["team_id"].isna()
+    if unknown.any():
+        print(f"  WARNING: dropping {int(unknown.sum())} team games with unknown abbreviations: "
+              f"{sorted(team_df.loc[unknown, 'team_abbr'].unique())}")
+        team_df = team_df[~unknown]
+    
+    games = [
+        {
+            "team_id": int(team_id),
+            "team_abbr": team_abbr,
+            "game_id": game_id,
+            "game_date": game_date,
+            "matchup": matchup,
+            "wl": wl,
+            "pts": int(pts),
+            "sport": "NBA",
+        }
+        for team_id, team_abbr, game_id, game_date, matchup, wl, pts in zip(
+            team_df["team_id"], team_df["team_abbr"], team_df["game_id"], team_df["game_date"],
+            team_df["matchup"], team_df["wl"], team_df["pts"],
+        )
+    ]
+    print(f"  Derived {len(games)} team game records")
+    return games
+
+
+def replace_quarantined_team_games(
+    team_games: list[dict],
+    quarantined: set[tuple[str, str]],
+    fetched: Optional[list[dict]] = None,
+) -> list[dict]:
+    """Swap derived team games that lost a player row to validation for TeamGameLogs rows.
+    
+    Their summed PTS would be too low (or the game missing), so they are taken from
+    the endpoint instead (fetched once if not already given); games it cannot supply
+    are dropped rather than written with a wrong total.
+    """
+    teams_set = get_postseason_teams()
+    quarantined = {key for key in quarantined if key[0] in teams_set}
+    if not quarantined:
+        return team_games
+    
+    print(f"  {len(quarantined)} team games lost player rows to validation - replacing from TeamGameLogs")
+    if fetched is None:
+        try:
+            fetched = filter_postseason_team_games(fetch_team_game_logs())
+        except RuntimeError as e:
+            print(f"  WARNING: {e} - dropping the affected team games instead")
+            fetched = []
+    
+    replacements = {
+        (g["team_abbr"], g["game_id"]): g for g in fetched if (g["team_abbr"], g["game_id"]) in quarantined
+    }
+    kept = [g for g in team_games if (g["team_abbr"], g["game_id"]) not in quarantined]
+    dropped = len(quarantined) - len(replacements)
+    if dropped:
+        print(f"  WARNING: no TeamGameLogs row for {dropped} affected team games - dropped")
+    print(f"  Replaced {len(replacements)} team games from TeamGameLogs")
+    return kept + list(replacements.values())
+
+
+def compare_team_game_logs(derived: list[dict], fetched: list[dict]) -> int:
+    """Cross-check derived team logs against TeamGameLogs. Returns the number of mismatches."""
+    fields = ["team_id", "game_date", "matchup", "wl", "pts"]
+    derived_map = {(g["team_abbr"], g["game_id"]): g for g in derived}
+    fetched_map = {(g["team_abbr"], g["game_id"]): g for g in fetched}
+    
+    mismatches = []
+    for key in fetched_map.keys() - derived_map.keys():
+        mismatches.append(f"{key}: missing from derived logs")
+    for key in derived_map.keys() - fetched_map.keys():
+        mismatches.append(f"{key}: not in TeamGameLogs")
+    for key in derived_map.keys() & fetched_map.keys():
+        for field in fields:
+            if derived_map[key][field] != fetched_map[key][field]:
+                mismatches.append(f"{key}: {field} derived={derived_map[key][field]!r} fetched={fetched_map[key][field]!r}")
+    
+    if mismatches:
+        print(f"  WARNING: {len(mismatches)} team log mismatches vs TeamGameLogs")
+        for line in sorted(mismatches)[:20]:
+            print(f"    {line}")
+    else:
+        print(f"  Team log parity OK: {len(derived)} derived records match TeamGameLogs")
+    return len(mismatches)
+
+
+def calculate_player_streaks(
+    pid: int,
+    player_name: str,
+    team_abbr: str,
+    games: list[dict],
+    min_streak_len: int = MIN_STREAK_LENGTH,
+) -> list[dict]:
+    """Calculate streaks for one player's games (most recent first) across all stats/thresholds."""
     streaks = []
+    if not games:
+        return streaks
     
-    for pid, data in player_data.items():
-        games = data["games"]
-        if not games:
-            continue
+    for stat_name, col_name in STAT_COLUMNS.items():
+        thresholds = STAT_THRESHOLDS.get(stat_name, [])
         
-        for stat_name, col_name in STAT_COLUMNS.items():
-            thresholds = STAT_THRESHOLDS.get(stat_name, [])
+        for threshold in thresholds:
+            # Calculate streak
+            streak_len = 0
+            streak_start = None
             
-            for threshold in thresholds:
-                # Calculate streak
-                streak_len = 0
-                streak_start = None
-                
-                for game in games:
-                    val = game.get(col_name)
-                    if val is not None and val >= threshold:
-                        streak_len += 1
-                        streak_start = game["game_date"]
-                    else:
-                        break
-                
-                if streak_len < MIN_STREAK_LENGTH:
-                    continue
-                
-                # Calculate season stats
-                season_wins = sum(1 for g in games if (g.get(col_name) or 0) >= threshold)
-                season_games = len(games)
-                season_win_pct = round((season_wins / season_games * 100), 1) if season_games > 0 else 0
-                
-                # Calculate L5, L10, L15, L20 stats
-                last5 = games[:5]
-                last5_hits = sum(1 for g in last5 if (g.get(col_name) or 0) >= threshold)
-                last5_games = len(last5)
-                last5_hit_pct = round((last5_hits / last5_games * 100), 1) if last5_games > 0 else None
-                
-                last10 = games[:10]
-                last10_hits = sum(1 for g in last10 if (g.get(col_name) or 0) >= threshold)
-                last10_games = len(last10)
-                last10_hit_pct = round((last10_hits / last10_games * 100), 1) if last10_games > 0 else None
-                
-                last15 = games[:15]
-                last15_hits = sum(1 for g in last15 if (g.get(col_name) or 0) >= threshold)
-                last15_games = len(last15)
-                last15_hit_pct = round((last15_hits / last15_games * 100), 1) if last15_games > 0 else None
-                
-                last20 = games[:20]
-                last20_hits = sum(1 for g in last20 if (g.get(col_name) or 0) >= threshold)
-                last20_games = len(last20)
-                last20_hit_pct = round((last20_hits / last20_games * 100), 1) if last20_games > 0 else None
-                
-                streaks.append({
-                    "player_id": pid,
-                    "player_name": data["player_name"],
-                    "team_abbr": data["team_abbr"],
-                    "stat": stat_name,
-                    "threshold": threshold,
-                    "streak_len": streak_len,
-                    "streak_start": streak_start,
-                    "streak_win_pct": 100.0,  # Current streak is 100% by definition
-                    "season_wins": season_wins,
-                    "season_games": season_games,
-                    "season_win_pct": season_win_pct,
-                    "last_game": games[0]["game_date"],
-                    "last5_hits": last5_hits,
-                    "last5_games": last5_games,
-                    "last5_hit_pct": last5_hit_pct,
-                    "last10_hits": last10_hits,
-                    "last10_games": last10_games,
-                    "last10_hit_pct": last10_hit_pct,
-                    "last15_hits": last15_hits,
-                    "last15_games": last15_games,
-                    "last15_hit_pct": last15_hit_pct,
-                    "last20_hits": last20_hits,
-                    "last20_games": last20_games,
-                    "last20_hit_pct": last20_hit_pct,
-                    "sport": "NBA",
-                    "entity_type": "player",
-                })
+            for game in games:
+                val = game.get(col_name)
+                if val is not None and val >= threshold:
+                    streak_len += 1
+                    streak_start = game["game_date"]
+                else:
+                    break
+            
+            if streak_len < min_streak_len:
+                continue
+            
+            # Calculate season stats
+            season_wins = sum(1 for g in games if (g.get(col_name) or 0) >= threshold)
+            season_games = len(games)
+            season_win_pct = round((season_wins / season_games * 100), 1) if season_games > 0 else 0
+            
+            # Calculate L5, L10, L15, L20 stats
+            last5 = games[:5]
+            last5_hits = sum(1 for g in last5 if (g.get(col_name) or 0) >= threshold)
+            last5_games = len(last5)
+            last5_hit_pct = round((last5_hits / last5_games * 100), 1) if last5_games > 0 else None
+            
+            last10 = games[:10]
+            last10_hits = sum(1 for g in last10 if (g.get(col_name) or 0) >= threshold)
+            last10_games = len(last10)
+            last10_hit_pct = round((last10_hits / last10_games * 100), 1) if last10_games > 0 else None
+            
+            last15 = games[:15]
+            last15_hits = sum(1 for g in last15 if (g.get(col_name) or 0) >= threshold)
+            last15_games = len(last15)
+            last15_hit_pct = round((last15_hits / last15_games * 100), 1) if last15_games > 0 else None
+            
+            last20 = games[:20]
+            last20_hits = sum(1 for g in last20 if (g.get(col_name) or 0) >= threshold)
+            last20_games = len(last20)
+            last20_hit_pct = round((last20_hits / last20_games * 100), 1) if last20_games > 0 else None
+            
+            streaks.append({
+                "player_id": pid,
+                "player_name": player_name,
+                "team_abbr": team_abbr,
+                "stat": stat_name,
+                "threshold": threshold,
+                "streak_type": "consecutive",
+                "streak_len": streak_len,
+                "streak_start": streak_start,
+                "streak_win_pct": 100.0,  # Current streak is 100% by definition
+                "season_wins": season_wins,
+                "season_games": season_games,
+                "season_win_pct": season_win_pct,
+                "last_game": games[0]["game_date"],
+                "last5_hits": last5_hits,
+                "last5_games": last5_games,
+                "last5_hit_pct": last5_hit_pct,
+                "last10_hits": last10_hits,
+                "last10_games": last10_games,
+                "last10_hit_pct": last10_hit_pct,
+                "last15_hits": last15_hits,
+                "last15_games": last15_games,
+                "last15_hit_pct": last15_hit_pct,
+                "last20_hits": last20_hits,
+                "last20_games": last20_games,
+                "last20_hit_pct": last20_hit_pct,
+                "sport": "NBA",
+                "entity_type": "player",
+            })
+    
+    return streaks
+
+
+def calculate_streaks(player_games: list[dict], workers: int = 1) -> list[dict]:
+    """Calculate player streaks for each player/stat/threshold combination.
+    
+    With workers > 1, players are sharded across processes (see streak_shards);
+    the output is identical to the single-process result.
+    """
+    print("Calculating player streaks...")
+    
+    player_data = group_player_games(player_games)
+    
+    if workers > 1 and len(player_data) > 1:
+        from streak_shards import calculate_streaks_sharded
+        
+        streaks = calculate_streaks_sharded(player_data, workers)
+        print(f"Found {len(streaks)} active player streaks ({workers} workers)")
+        return streaks
+    
+    streaks = []
+    for pid, data in player_data.items():
+        streaks.extend(calculate_player_streaks(pid, data["player_name"], data["team_abbr"], data["games"]))
     
     print(f"Found {len(streaks)} active player streaks")
     return streaks
@@ -378,7 +634,7 @@ def calculate_team_streaks(team_games: list[dict]) -> list[dict]:
     print("Calculating team streaks...")
     
     # Get team name mapping
-    nba_teams = {t["abbreviation"]: t["full_name"] for t in teams.get_teams()}
+    nba_teams = get_team_names()
     
     # Group games by team
     team_data = {}
@@ -435,6 +691,7 @@ def calculate_team_streaks(team_games: list[dict]) -> list[dict]:
                 "team_abbr": data["team_abbr"],
                 "stat": "ML",
                 "threshold": 1,
+                "streak_type": "consecutive",
                 "streak_len": ml_streak_len,
                 "streak_start": ml_streak_start,
                 "streak_win_pct": 100.0,
@@ -493,6 +750,7 @@ def calculate_team_streaks(team_games: list[dict]) -> list[dict]:
                 "team_abbr": data["team_abbr"],
                 "stat": "PTS",
                 "threshold": threshold,
+                "streak_type": "consecutive",
                 "streak_len": streak_len,
                 "streak_start": streak_start,
                 "streak_win_pct": 100.0,
@@ -551,6 +809,7 @@ def calculate_team_streaks(team_games: list[dict]) -> list[dict]:
                 "team_abbr": data["team_abbr"],
                 "stat": "PTS_U",
                 "threshold": threshold,
+                "streak_type": "consecutive",
                 "streak_len": streak_len,
                 "streak_start": streak_start,
                 "streak_win_pct": 100.0,
@@ -578,31 +837,42 @@ def calculate_team_streaks(team_games: list[dict]) -> list[dict]:
     return streaks
 
 
+def streak_key(s: dict) -> tuple:
+    """Identity of a streak across runs: entity, stat, threshold and streak type."""
+    entity = s["team_abbr"] if s["entity_type"] == "team" else s["player_id"]
+    return (entity, s["stat"], s["threshold"], s.get("streak_type") or "consecutive", s["entity_type"])
+
+
 def detect_streak_events(
     supabase: Client,
     new_streaks: list[dict],
 ) -> list[dict]:
-    """Compare new streaks with existing ones to detect started/extended/broken events."""
+    """Compare new streaks with existing ones to detect started/extended/broken events.
+    
+    Existing streaks come from the local snapshot of the last sync when the remote
+    checksum still matches it, otherwise from a full read of the streaks table.
+    """
+    from streak_snapshot import load_snapshot, remote_checksum
+    
     print("Detecting streak events...")
     
-    # Fetch existing streaks
-    result = supabase.table("streaks").select("*").eq("sport", "NBA").execute()
+    snapshot = load_snapshot(SNAPSHOT_PATH)
+    if snapshot is not None and snapshot[0] == remote_checksum(supabase):
+        existing = snapshot[1]
+        print(f"  Using local streak snapshot ({len(existing)} streaks)")
+    else:
+        reason = "no usable snapshot" if snapshot is None else "snapshot out of date"
+        print(f"  Reading streaks table ({reason})")
+        existing = supabase.table("streaks").select("*").eq("sport", "NBA").execute().data
     
-    # Create keys based on entity type
     old_streaks = {}
-    for s in result.data:
-        if s["entity_type"] == "team":
-            key = (s["team_abbr"], s["stat"], s["threshold"], "team")
-        else:
-            key = (s["player_id"], s["stat"], s["threshold"], "player")
+    for s in existing:
+        key = streak_key(s)
         old_streaks[key] = s
     
     new_streaks_map = {}
     for s in new_streaks:
-        if s["entity_type"] == "team":
-            key = (s["team_abbr"], s["stat"], s["threshold"], "team")
-        else:
-            key = (s["player_id"], s["stat"], s["threshold"], "player")
+        key = streak_key(s)
         new_streaks_map[key] = s
     
     events = []
@@ -619,6 +889,7 @@ def detect_streak_events(
                 "team_abbr": new_s["team_abbr"],
                 "stat": new_s["stat"],
                 "threshold": new_s["threshold"],
+                "streak_type": new_s.get("streak_type") or "consecutive",
                 "event_type": "extended",  # New streak (maps to "extended" per DB constraint)
                 "prev_streak_len": 0,
                 "new_streak_len": new_s["streak_len"],
@@ -634,6 +905,7 @@ def detect_streak_events(
                 "team_abbr": new_s["team_abbr"],
                 "stat": new_s["stat"],
                 "threshold": new_s["threshold"],
+                "streak_type": new_s.get("streak_type") or "consecutive",
                 "event_type": "extended",
                 "prev_streak_len": old_s["streak_len"],
                 "new_streak_len": new_s["streak_len"],
@@ -651,6 +923,7 @@ def detect_streak_events(
                 "team_abbr": old_s["team_abbr"],
                 "stat": old_s["stat"],
                 "threshold": old_s["threshold"],
+                "streak_type": old_s.get("streak_type") or "consecutive",
                 "event_type": "broke",  # Streak ended - maps to "broke" per DB constraint
                 "prev_streak_len": old_s["streak_len"],
                 "new_streak_len": 0,
@@ -663,20 +936,94 @@ def detect_streak_events(
     return events
 
 
-def insert_streak_events(supabase: Client, events: list[dict]) -> None:
-    """Insert streak events with validation and chunked batches. Fails run if any chunk fails."""
+def send_chunks(rows: list[dict], chunk_size: int, concurrency: int, send) -> None:
+    """Call send(chunk_num, total_chunks, chunk) for each chunk, on up to `concurrency` threads.
+    
+    The first exception from send() propagates: chunks not yet started are cancelled,
+    chunks already in flight still complete.
+    """
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    total_chunks = len(chunks)
+    if concurrency <= 1 or total_chunks <= 1:
+        for chunk_num, chunk in enumerate(chunks, start=1):
+            send(chunk_num, total_chunks, chunk)
+        return
+    
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    
+    # Workers pick up queued chunks immediately, so check a flag rather than
+    # relying on cancelling futures to stop writes after a failure
+    failed = threading.Event()
+    
+    def send_unless_failed(chunk_num, chunk):
+        if failed.is_set():
+            return
+        try:
+            send(chunk_num, total_chunks, chunk)
+        except BaseException:
+            failed.set()
+            raise
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(send_unless_failed, chunk_num, chunk)
+            for chunk_num, chunk in enumerate(chunks, start=1)
+        ]
+        for future in futures:
+            future.result()
+
+
+def streak_event_key(event: dict) -> str:
+    """Deterministic event id: sha256 of what the event says, so a retried or overlapping run maps to the same row.
+    
+    Must stay in sync with the backfill in the add_streak_event_key migration
+    (scripts/check_refresh.py pins a sample digest). A missing entity is "", like
+    the backfill's coalesce; concat_ws would otherwise skip the field.
+    """
+    threshold = event["threshold"]
+    if isinstance(threshold, float) and threshold.is_integer():
+        threshold = int(threshold)
+    entity = event.get("team_abbr") if event["entity_type"] == "team" else event.get("player_id")
+    if entity is None:
+        entity = ""
+    parts = [
+        event.get("sport") or "NBA",
+        event["entity_type"],
+        entity,
+        event["stat"],
+        threshold,
+        event.get("streak_type") or "consecutive",
+        event["event_type"],
+        event.get("new_streak_len") or 0,
+        event.get("last_game") or "",
+    ]
+    return hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+def insert_streak_events(
+    supabase: Client,
+    events: list[dict],
+    chunk_size: int = EVENT_CHUNK_SIZE,
+    concurrency: int = WRITE_CONCURRENCY,
+) -> None:
+    """Upsert streak events keyed by streak_event_key, ignoring ones already written. Fails run if any chunk fails.
+    
+    Retries and overlapping runs are no-ops for events that already exist.
+    """
     if not events:
         print("No streak events to insert")
         return
     
-    # Pre-validate event types
-    valid_events = []
+    # Pre-validate event types and drop duplicates within this batch
+    valid_events = {}
     invalid_events = []
     for event in events:
         event_type = event.get("event_type")
         if event_type in ALLOWED_EVENT_TYPES:
+            event["event_key"] = streak_event_key(event)
             event["created_at"] = datetime.now(timezone.utc).isoformat()
-            valid_events.append(event)
+            valid_events.setdefault(event["event_key"], event)
         else:
             invalid_events.append(event)
             print(f"  WARNING: Invalid event_type '{event_type}' for {event.get('player_name')} - skipping")
@@ -688,48 +1035,29 @@ def insert_streak_events(supabase: Client, events: list[dict]) -> None:
         print("No valid events to insert after filtering")
         return
     
-    # Insert in chunks - fail the run if any chunk fails
-    chunk_size = 200
-    inserted = 0
-    for i in range(0, len(valid_events), chunk_size):
-        chunk = valid_events[i:i + chunk_size]
-        chunk_num = i // chunk_size + 1
-        total_chunks = (len(valid_events) + chunk_size - 1) // chunk_size
-        
+    # Upsert in chunks - fail the run if any chunk fails
+    def send(chunk_num: int, total_chunks: int, chunk: list[dict]) -> None:
         try:
-            supabase.table("streak_events").insert(chunk).execute()
-            inserted += len(chunk)
-            print(f"  Inserted chunk {chunk_num}/{total_chunks} ({len(chunk)} events)")
+            supabase.table("streak_events").upsert(chunk, on_conflict="event_key", ignore_duplicates=True).execute()
+            print(f"  Upserted chunk {chunk_num}/{total_chunks} ({len(chunk)} events)")
         except Exception as e:
-            print(f"  ERROR inserting chunk {chunk_num}/{total_chunks}: {e}")
+            print(f"  ERROR writing chunk {chunk_num}/{total_chunks}: {e}")
             print(f"  First event in failed chunk: {chunk[0]}")
-            raise RuntimeError(f"Failed to insert streak events chunk {chunk_num}: {e}")
+            raise RuntimeError(f"Failed to write streak events chunk {chunk_num}: {e}")
     
-    print(f"Successfully inserted {inserted} streak events")
-
-
-def validate_data_freshness(games: list[dict], entity_type: str) -> bool:
-    """Check if fetched data includes recent games. Returns True if fresh, False if stale."""
-    if not games:
-        return False
+    send_chunks(list(valid_events.values()), chunk_size, concurrency, send)
     
-    # Find the most recent game date
-    max_date = max(g["game_date"] for g in games)
-    max_date_dt = datetime.strptime(max_date, "%Y-%m-%d")
-    
-    # Data should be from within last 2 days (accounting for off-days)
-    today = datetime.now()
-    days_old = (today - max_date_dt).days
-    
-    if days_old > 2:
-        print(f"  WARNING: {entity_type} data is {days_old} days old (max date: {max_date})")
-        return False
-    
-    print(f"  Data freshness OK: most recent {entity_type} game is {max_date}")
-    return True
+    print(f"Successfully wrote {len(valid_events)} streak events (existing event keys ignored)")
 
 
-def upsert_data(supabase: Client, table: str, data: list[dict], conflict_cols: Optional[list[str]] = None):
+def upsert_data(
+    supabase: Client,
+    table: str,
+    data: list[dict],
+    conflict_cols: Optional[list[str]] = None,
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+    concurrency: int = WRITE_CONCURRENCY,
+):
     """Upsert data to a Supabase table."""
     if not data:
         print(f"No data to upsert to {table}")
@@ -743,15 +1071,14 @@ def upsert_data(supabase: Client, table: str, data: list[dict], conflict_cols: O
         record["updated_at"] = now
     
     # Batch upsert in chunks
-    chunk_size = 500
-    for i in range(0, len(data), chunk_size):
-        chunk = data[i:i + chunk_size]
-        
+    def send(chunk_num: int, total_chunks: int, chunk: list[dict]) -> None:
         if conflict_cols:
             supabase.table(table).upsert(chunk, on_conflict=",".join(conflict_cols)).execute()
         else:
             supabase.table(table).upsert(chunk).execute()
     
+    send_chunks(data, chunk_size, concurrency, send)
+    
     print(f"Successfully upserted to {table}")
 
 
@@ -814,102 +1141,361 @@ def filter_postseason_team_games(games: list[dict]) -> list[dict]:
     return filtered
 
 
-def main():
-    """Main entry point."""
-    start_time = datetime.now()
-    print(f"=== NBA Data Refresh Started at {start_time.isoformat()} ===\n")
-    print(f"Season: {get_season_string()}")
-    print(f"Season start: {get_season_start_date().strftime('%Y-%m-%d')}")
-    print(f"Postseason mode: {POSTSEASON_MODE} ({len(get_postseason_teams())} teams)\n")
-    
-    supabase = get_supabase_client()
-    
-    # 1. Fetch and upsert today's games
-    games = fetch_todays_games()
-    if games:
-        upsert_data(supabase, "games_today", games)
-    update_refresh_status(supabase, 2)  # id=2 for games
+def fetch_all(
+    profiler: StageProfiler,
+    verify_team_logs: bool = False,
+) -> tuple[list[dict], list[dict], list[dict], list[dict]]:
+    """Fetch today's games and player logs, derive team logs, with fail-fast and postseason filtering.
+    
+    Returns (games, player_games, team_games, league_player_games); the last is the
+    validated player logs before the postseason filter, for league-wide aggregates.
+    """
+    # 1. Fetch today's games
+    with profiler.stage("todays_games"):
+        games = fetch_todays_games()
     
     print()
     
     # 2. Fetch player game logs (will raise on failure after retries)
-    player_games = fetch_player_game_logs()
-    
-    # Fail-fast: empty results = hard fail
-    if len(player_games) == 0:
-        print("ERROR: Player game fetch returned 0 records - aborting to prevent data loss")
-        sys.exit(1)
-    
-    # Warning for suspiciously low counts
-    if len(player_games) < 100:
-        print(f"WARNING: Only {len(player_games)} player games - unusually low")
+    with profiler.stage("player_logs"):
+        player_games, quarantined_team_games = fetch_player_game_logs()
+        
+        # Fail-fast: empty results = hard fail
+        if len(player_games) == 0:
+            print("ERROR: Player game fetch returned 0 records - aborting to prevent data loss")
+            sys.exit(1)
+        
+        # Warning for suspiciously low counts
+        if len(player_games) < 100:
+            print(f"WARNING: Only {len(player_games)} player games - unusually low")
+        
+        # Filter to postseason-relevant teams only
+        league_player_games = player_games
+        player_games = filter_postseason_player_games(player_games)
     
-    # Freshness check (warning only, doesn't abort)
-    validate_data_freshness(player_games, "player")
+    print()
     
-    # Filter to postseason-relevant teams only
-    player_games = filter_postseason_player_games(player_games)
+    # 3. Derive team game logs from the (already filtered) player logs
+    with profiler.stage("team_logs"):
+        team_games = derive_team_game_logs(player_games)
+        
+        if len(team_games) == 0:
+            print("ERROR: Team game derivation returned 0 records - aborting to prevent data loss")
+            sys.exit(1)
+        
+        if len(team_games) < 30:
+            print(f"WARNING: Only {len(team_games)} team games - unusually low")
+        
+        # Optional cross-check against the TeamGameLogs endpoint; a failure only skips the report
+        fetched = None
+        if verify_team_logs:
+            try:
+                fetched = filter_postseason_team_games(fetch_team_game_logs())
+            except RuntimeError as e:
+                print(f"  WARNING: {e} - skipping team log verification")
+                # Don't retry the endpoint for quarantined games below
+                fetched = []
+            else:
+                compare_team_game_logs(team_games, fetched)
+        
+        if quarantined_team_games:
+            team_games = replace_quarantined_team_games(team_games, quarantined_team_games, fetched)
     
-    upsert_data(supabase, "player_recent_games", player_games, ["player_id", "game_id"])
+    print()
+    return games, player_games, team_games, league_player_games
+
+
+def sync_game_data(
+    profiler: StageProfiler,
+    supabase: Client,
+    games: list[dict],
+    player_games: list[dict],
+    team_games: list[dict],
+) -> None:
+    """Upsert today's games and the season logs."""
+    with profiler.stage("sync_logs"):
+        if games:
+            upsert_data(supabase, "games_today", games)
+        update_refresh_status(supabase, 2)  # id=2 for games
+        
+        upsert_data(supabase, "player_recent_games", player_games, ["player_id", "game_id"])
+        upsert_data(supabase, "team_recent_games", team_games, ["team_id", "game_id"])
     
     print()
+
+
+def compute_all(
+    profiler: StageProfiler,
+    games: list[dict],
+    player_games: list[dict],
+    team_games: list[dict],
+    league_player_games: list[dict],
+    workers: int = 1,
+) -> dict[str, list[dict]]:
+    """Calculate all derived outputs (pure computation, no network), keyed like COMPUTED_TABLES.
+    
+    Team defense uses league_player_games (all teams): what a defense allows must
+    count every opponent it played, not just postseason-filtered teams.
+    """
+    from split_streaks import calculate_split_streaks
+    from stat_distributions import calculate_stat_distributions
+    from team_defense import calculate_team_defense
+    from window_streaks import calculate_window_streaks
+    
+    with profiler.stage("player_streaks"):
+        player_streaks = calculate_streaks(player_games, workers)
+    
+    with profiler.stage("team_streaks"):
+        team_streaks = calculate_team_streaks(team_games)
+    
+    with profiler.stage("window_streaks"):
+        window_streaks = calculate_window_streaks(player_games)
+    
+    with profiler.stage("split_streaks"):
+        split_streaks = calculate_split_streaks(player_games, games)
+    
+    with profiler.stage("team_defense"):
+        team_defense = calculate_team_defense(league_player_games)
+    
+    with profiler.stage("stat_distributions"):
+        stat_distributions = calculate_stat_distributions(player_games)
+    
+    return {
+        "streaks": player_streaks + team_streaks + window_streaks,
+        "split_streaks": split_streaks,
+        "team_defense": team_defense,
+        "stat_distributions": stat_distributions,
+    }
+
+
+def process_events(profiler: StageProfiler, supabase: Client, all_streaks: list[dict]) -> list[dict]:
+    """Detect streak events against the current streaks table and insert them."""
+    with profiler.stage("streak_events"):
+        events = detect_streak_events(supabase, all_streaks)
+        
+        # Insert events using validated chunked insert (will raise on failure)
+        insert_streak_events(supabase, events)
     
-    # 3. Fetch team game logs (will raise on failure after retries)
-    team_games = fetch_team_game_logs()
+    return events
+
+
+def sync_streaks(profiler: StageProfiler, supabase: Client, computed: dict[str, list[dict]]) -> None:
+    """Replace the computed tables, mark the refresh complete and trigger scoring."""
+    with profiler.stage("streaks_write"):
+        for name, table in COMPUTED_TABLES.items():
+            rows = computed.get(name)
+            if rows is None:
+                continue
+            print(f"Replacing {table} table...")
+            supabase.table(table).delete().eq("sport", "NBA").execute()
+            if rows:
+                upsert_data(supabase, table, rows)
+        
+        if computed.get("streaks") is not None:
+            from streak_snapshot import remote_checksum, save_snapshot
+            
+            save_snapshot(SNAPSHOT_PATH, computed["streaks"], remote_checksum(supabase))
+            print(f"Saved streak snapshot to {SNAPSHOT_PATH}")
+        
+        update_refresh_status(supabase, 1)  # id=1 for players/streaks
     
-    if len(team_games) == 0:
-        print("ERROR: Team game fetch returned 0 records - aborting to prevent data loss")
+    # Trigger prop-scoring-engine edge function
+    with profiler.stage("scoring_engine"):
+        trigger_scoring_engine(supabase)
+
+
+def load_cached_logs() -> tuple[list[dict], list[dict], list[dict], list[dict]]:
+    """Load fetched games/logs from the cache, exiting if `fetch` has not been run."""
+    player_games = load_cache("player_games")
+    team_games = load_cache("team_games")
+    league_player_games = load_cache("league_player_games")
+    if player_games is None or team_games is None or league_player_games is None:
+        print(f"ERROR: No cached game logs in {CACHE_DIR} - run the 'fetch' subcommand first")
         sys.exit(1)
+    return load_cache("games_today") or [], player_games, team_games, league_player_games
+
+
+def load_cached_streaks() -> list[dict]:
+    """Load computed streaks from the cache, exiting if `compute` has not been run."""
+    all_streaks = load_cache("streaks")
+    if all_streaks is None:
+        print(f"ERROR: No cached streaks in {CACHE_DIR} - run the 'compute' subcommand first")
+        sys.exit(1)
+    return all_streaks
+
+
+def cmd_run(args, profiler: StageProfiler):
+    """Full pipeline: fetch, sync logs, compute, events, sync streaks."""
+    print(f"Season: {get_season_string()}")
+    print(f"Season start: {get_season_start_date().strftime('%Y-%m-%d')}")
+    print(f"Postseason mode: {POSTSEASON_MODE} ({len(get_postseason_teams())} teams)\n")
     
-    if len(team_games) < 30:
-        print(f"WARNING: Only {len(team_games)} team games - unusually low")
-    
-    validate_data_freshness(team_games, "team")
+    supabase = get_supabase_client()
     
-    # Filter to postseason-relevant teams only
-    team_games = filter_postseason_team_games(team_games)
+    games, player_games, team_games, league_player_games = fetch_all(profiler, args.verify_team_logs)
+    sync_game_data(profiler, supabase, games, player_games, team_games)
     
-    upsert_data(supabase, "team_recent_games", team_games, ["team_id", "game_id"])
+    computed = compute_all(profiler, games, player_games, team_games, league_player_games, args.workers)
+    all_streaks = computed["streaks"]
     
-    print()
+    events = process_events(profiler, supabase, all_streaks)
+    sync_streaks(profiler, supabase, computed)
     
-    # 4. Calculate player streaks
-    player_streaks = calculate_streaks(player_games)
+    print(f"Games today: {len(games)}")
+    print(f"Player game records: {len(player_games)}")
+    print(f"Team game records: {len(team_games)}")
+    print(f"Player streaks: {sum(1 for s in all_streaks if s['entity_type'] == 'player')}")
+    print(f"Team streaks: {sum(1 for s in all_streaks if s['entity_type'] == 'team')}")
+    print(f"Split streaks: {len(computed['split_streaks'])}")
+    print(f"Team defense rows: {len(computed['team_defense'])}")
+    print(f"Stat distribution rows: {len(computed['stat_distributions'])}")
+    print(f"Streak events: {len(events)}")
+
+
+def cmd_fetch(args, profiler: StageProfiler):
+    """Fetch from nba_api into the local cache."""
+    games, player_games, team_games, league_player_games = fetch_all(profiler, args.verify_team_logs)
+    save_cache("games_today", games)
+    save_cache("player_games", player_games)
+    save_cache("team_games", team_games)
+    save_cache("league_player_games", league_player_games)
+    print(f"Cached {len(games)} games, {len(player_games)} player and {len(team_games)} team records in {CACHE_DIR}")
+
+
+def cmd_compute(args, profiler: StageProfiler):
+    """Compute streaks from cached logs."""
+    games, player_games, team_games, league_player_games = load_cached_logs()
+    computed = compute_all(profiler, games, player_games, team_games, league_player_games, args.workers)
+    for name, rows in computed.items():
+        save_cache(name, rows)
+    print(f"Cached {', '.join(f'{len(rows)} {name}' for name, rows in computed.items())} in {CACHE_DIR}")
+
+
+def cmd_events(args, profiler: StageProfiler):
+    """Detect and insert streak events for the cached streaks (run before `sync`)."""
+    all_streaks = load_cached_streaks()
+    supabase = get_supabase_client()
+    events = process_events(profiler, supabase, all_streaks)
+    print(f"Streak events: {len(events)}")
+
+
+def cmd_sync(args, profiler: StageProfiler):
+    """Upsert cached games/logs, then replace streaks if they have been computed."""
+    games, player_games, team_games, _ = load_cached_logs()
+    supabase = get_supabase_client()
+    sync_game_data(profiler, supabase, games, player_games, team_games)
     
-    # 5. Calculate team streaks
-    team_streaks = calculate_team_streaks(team_games)
+    computed = {name: load_cache(name) for name in COMPUTED_TABLES}
+    if computed["streaks"] is None:
+        print("No cached streaks - skipping streaks table (run 'compute' and 'events' first)")
+        return
+    sync_streaks(profiler, supabase, computed)
+
+
+def cmd_status(args, profiler: StageProfiler):
+    """Show local cache contents and the remote refresh_status rows."""
+    import urllib.request
     
-    # 6. Combine all streaks
-    all_streaks = player_streaks + team_streaks
+    print(f"Cache: {CACHE_DIR}")
+    for name in ("games_today", "player_games", "team_games", "league_player_games", *COMPUTED_TABLES):
+        path = os.path.join(CACHE_DIR, f"{name}.json")
+        if os.path.exists(path):
+            mtime = datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec="seconds")
+            print(f"  {name:<20} {os.path.getsize(path) / 1024:10.1f} KiB  {mtime}")
+        else:
+            print(f"  {name:<20} (missing)")
     
-    # 7. Detect streak events
-    events = detect_streak_events(supabase, all_streaks)
+    url = os.environ.get("SUPABASE_URL")
+    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key:
+        print("Remote: SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY not set - skipping")
+        return
     
-    # 8. Insert events using validated chunked insert (will raise on failure)
-    insert_streak_events(supabase, events)
+    # Plain REST read: keeps `status` free of the supabase client import
+    req = urllib.request.Request(
+        f"{url}/rest/v1/refresh_status?select=id,last_run&sport=eq.NBA&order=id",
+        headers={"apikey": key, "Authorization": f"Bearer {key}"},
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=BASE_TIMEOUT) as resp:
+            rows = json.loads(resp.read().decode("utf-8"))
+    except Exception as e:
+        print(f"Remote: refresh_status read failed: {e}")
+        sys.exit(1)
     
-    # 9. Replace streaks table (delete old, insert new)
-    print("Replacing streaks table...")
-    supabase.table("streaks").delete().eq("sport", "NBA").execute()
-    if all_streaks:
-        upsert_data(supabase, "streaks", all_streaks)
+    print("Remote refresh_status:")
+    for row in rows:
+        print(f"  id={row['id']}  last_run={row['last_run']}")
+
+
+def cmd_backtest(args, profiler: StageProfiler):
+    """Replay cached logs as-of each game date and report next-game hit rates by streak length."""
+    from asof_streaks import run_backtest
     
-    # 10. Update refresh status
-    update_refresh_status(supabase, 1)  # id=1 for players/streaks
+    _, player_games, _, _ = load_cached_logs()
+    with profiler.stage("backtest"):
+        run_backtest(player_games, min_games=args.min_games, out_path=args.out)
+
+
+COMMANDS = {
+    "run": cmd_run,
+    "fetch": cmd_fetch,
+    "compute": cmd_compute,
+    "events": cmd_events,
+    "sync": cmd_sync,
+    "status": cmd_status,
+    "backtest": cmd_backtest,
+}
+
+
+def main(argv: Optional[list[str]] = None):
+    """Main entry point."""
+    # dest → (flags, add_argument kwargs, top-level default)
+    options = {
+        "profile": (["--profile"], {
+            "metavar": "DIR",
+            "help": "Write per-stage cProfile dumps, collapsed stacks and allocation summaries to DIR",
+        }, None),
+        "workers": (["--workers"], {
+            "type": int,
+            "help": "Processes for player streak computation (default: $REFRESH_WORKERS or 1)",
+        }, int(os.environ.get("REFRESH_WORKERS", "1"))),
+        "verify_team_logs": (["--verify-team-logs"], {
+            "action": "store_true",
+            "help": "Also fetch TeamGameLogs and report mismatches with the team logs derived from player logs",
+        }, False),
+    }
+    command_options = {
+        "run": ["profile", "workers", "verify_team_logs"],
+        "fetch": ["profile", "verify_team_logs"],
+        "compute": ["profile", "workers"],
+    }
+    
+    parser = argparse.ArgumentParser(description="Refresh NBA data in Supabase.")
+    for flags, kwargs, default in options.values():
+        parser.add_argument(*flags, default=default, **kwargs)
+    subparsers = parser.add_subparsers(dest="command")
+    for name, handler in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=handler.__doc__)
+        # Also accepted after the subcommand; SUPPRESS keeps a value given before it
+        for dest in command_options.get(name, ["profile"]):
+            flags, kwargs, _ = options[dest]
+            subparser.add_argument(*flags, default=argparse.SUPPRESS, **kwargs)
+    backtest_parser = subparsers.choices["backtest"]
+    backtest_parser.add_argument("--min-games", type=int, default=5, help="Skip snapshots with fewer prior games")
+    backtest_parser.add_argument("--out", metavar="CSV", help="Also write the results table to CSV")
+    args = parser.parse_args(argv)
+    command = args.command or "run"
+    profiler = StageProfiler(args.profile)
     
-    # 11. Trigger prop-scoring-engine edge function
-    trigger_scoring_engine(supabase)
+    start_time = datetime.now()
+    print(f"=== NBA Data Refresh ({command}) Started at {start_time.isoformat()} ===\n")
     
-    end_time = datetime.now()
-    duration = (end_time - start_time).total_seconds()
+    COMMANDS[command](args, profiler)
     
-    print(f"\n=== Refresh Complete in {duration:.1f}s ===")
-    print(f"Games today: {len(games)}")
-    print(f"Player game records: {len(player_games)}")
-    print(f"Team game records: {len(team_games)}")
-    print(f"Player streaks: {len(player_streaks)}")
-    print(f"Team streaks: {len(team_streaks)}")
-    print(f"Streak events: {len(events)}")
+    duration = (datetime.now() - start_time).total_seconds()
+    profiler.write_summary(duration)
+    print(f"\n=== Refresh ({command}) Complete in {duration:.1f}s ===")
 
 
 if __name__ == "__main__":
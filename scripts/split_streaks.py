@@ -0,0 +1,94 @@
+"""
+Split streaks: home/away, vs. tonight's opponent, and rest-day buckets.
+
+One pass over each player's games (most recent first) builds a multi-key group
+index (pid, split_type, split_value) → games, using the parsed `matchup` and the
+gap to the player's previous game. Each group is then scored with the same
+calculate_player_streaks used for overall streaks, so a split row carries the
+same streak / season / L5-L20 fields plus split_type and split_value.
+"""
+
+from datetime import date
+
+from refresh import calculate_player_streaks, group_player_games, parse_matchup
+
+# Minimum streak length per split type. Opponent splits have at most four games
+# a season, so a shorter run is still worth surfacing.
+SPLIT_MIN_STREAK_LENGTH = {
+    "home": 3,
+    "away": 3,
+    "rest": 3,
+    "opp": 2,
+}
+
+
+def rest_bucket(days_rest: int) -> str:
+    """Bucket days of rest before a game: "0" (back-to-back), "1", "2+"."""
+    if days_rest <= 0:
+        return "0"
+    if days_rest == 1:
+        return "1"
+    return "2+"
+
+
+def get_tonights_opponents(todays_games: list[dict]) -> dict[str, str]:
+    """Map team_abbr → opponent_abbr for today's scoreboard."""
+    opponents = {}
+    for game in todays_games:
+        home, away = game.get("home_team_abbr"), game.get("away_team_abbr")
+        if home and away:
+            opponents[home] = away
+            opponents[away] = home
+    return opponents
+
+
+def build_split_index(player_data: dict[int, dict]) -> dict[tuple, list[dict]]:
+    """Single pass: (pid, split_type, split_value) → games, preserving most-recent-first order."""
+    index: dict[tuple, list[dict]] = {}
+    for pid, data in player_data.items():
+        games = data["games"]
+        # Parse each date once; rest is the gap to the next (older) game
+        days = [date.fromisoformat(g["game_date"]).toordinal() for g in games]
+        for i, game in enumerate(games):
+            is_home, opponent = parse_matchup(game.get("matchup"))
+            keys = []
+            if is_home is not None:
+                keys.append((pid, "home" if is_home else "away", "all"))
+            if opponent:
+                keys.append((pid, "opp", opponent))
+            if i + 1 < len(games):
+                keys.append((pid, "rest", rest_bucket(days[i] - days[i + 1] - 1)))
+            for key in keys:
+                index.setdefault(key, []).append(game)
+    return index
+
+
+def calculate_split_streaks(player_games: list[dict], todays_games: list[dict]) -> list[dict]:
+    """Calculate home/away, vs-tonight's-opponent and rest-bucket streaks for every player."""
+    print("Calculating split streaks...")
+
+    player_data = group_player_games(player_games)
+    index = build_split_index(player_data)
+    opponents = get_tonights_opponents(todays_games)
+
+    streaks = []
+    for (pid, split_type, split_value), games in index.items():
+        data = player_data[pid]
+        # Only the matchup the player actually has tonight
+        if split_type == "opp" and opponents.get(data["team_abbr"]) != split_value:
+            continue
+
+        rows = calculate_player_streaks(
+            pid,
+            data["player_name"],
+            data["team_abbr"],
+            games,
+            min_streak_len=SPLIT_MIN_STREAK_LENGTH[split_type],
+        )
+        for row in rows:
+            row["split_type"] = split_type
+            row["split_value"] = split_value
+        streaks.extend(rows)
+
+    print(f"Found {len(streaks)} active split streaks ({len(index)} split groups)")
+    return streaks
@@ -0,0 +1,140 @@
+"""
+Per-stage profiling for the refresh pipeline.
+
+When enabled, each `with profiler.stage("name"):` block records:
+  - a cProfile dump            → <out_dir>/<NN>_<name>.pstats
+  - sampled call stacks        → <out_dir>/profile.collapsed  (flamegraph.pl / speedscope input,
+                                 one line per stack, stage name as the root frame)
+  - tracemalloc top allocations → <out_dir>/allocations.txt
+  - wall time + peak traced memory per stage → <out_dir>/stages.json
+
+When disabled (no output dir), stage() is a no-op context manager so main() pays nothing.
+"""
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional
+
+# Sampling interval for the collapsed-stack sampler (seconds)
+SAMPLE_INTERVAL = 0.005
+
+# Number of allocation sites reported per stage
+TOP_ALLOCATIONS = 25
+
+
+class _StackSampler(threading.Thread):
+    """Background thread that periodically samples one thread's Python stack."""
+
+    def __init__(self, target_thread_id: int, interval: float = SAMPLE_INTERVAL):
+        super().__init__(name="stage-profiler-sampler", daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            if frame is None:
+                continue
+            parts = []
+            while frame is not None:
+                code = frame.f_code
+                parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(parts))] += 1
+
+    def stop(self) -> Counter:
+        self._stop_event.set()
+        self.join()
+        return self.stacks
+
+
+class StageProfiler:
+    """Collects cProfile, sampled stacks and tracemalloc stats for named pipeline stages."""
+
+    def __init__(self, out_dir: Optional[str] = None, top_n: int = TOP_ALLOCATIONS):
+        self.out_dir = out_dir
+        self.top_n = top_n
+        self.stages: list[dict] = []
+
+        if self.out_dir:
+            os.makedirs(self.out_dir, exist_ok=True)
+            # Truncate combined outputs from any previous run in the same directory
+            for name in ("profile.collapsed", "allocations.txt"):
+                open(os.path.join(self.out_dir, name), "w").close()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.out_dir)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Profile the enclosed block as a named stage (no-op when disabled)."""
+        if not self.enabled:
+            yield
+            return
+
+        index = len(self.stages) + 1
+        sampler = _StackSampler(threading.get_ident())
+        profile = cProfile.Profile()
+
+        tracemalloc.start()
+        sampler.start()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            stacks = sampler.stop()
+            snapshot = tracemalloc.take_snapshot()
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            self._write_stage(index, name, profile, stacks, snapshot)
+            self.stages.append({
+                "index": index,
+                "stage": name,
+                "seconds": round(elapsed, 3),
+                "peak_traced_mb": round(peak_bytes / (1024 * 1024), 2),
+                "samples": sum(stacks.values()),
+            })
+            print(f"  [profile] {name}: {elapsed:.2f}s, peak traced {peak_bytes / (1024 * 1024):.1f} MB")
+
+    def _write_stage(self, index: int, name: str, profile: cProfile.Profile, stacks: Counter, snapshot):
+        profile.dump_stats(os.path.join(self.out_dir, f"{index:02d}_{name}.pstats"))
+
+        with open(os.path.join(self.out_dir, "profile.collapsed"), "a") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{name};{stack} {count}\n")
+
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        top = snapshot.statistics("lineno")[:self.top_n]
+        with open(os.path.join(self.out_dir, "allocations.txt"), "a") as f:
+            f.write(f"=== {index:02d} {name} (top {len(top)} allocation sites) ===\n")
+            for stat in top:
+                frame = stat.traceback[0]
+                f.write(f"{stat.size / 1024:10.1f} KiB  {stat.count:8d} blocks  {frame.filename}:{frame.lineno}\n")
+            f.write("\n")
+
+    def write_summary(self, total_seconds: float):
+        """Write stages.json with per-stage timings (no-op when disabled)."""
+        if not self.enabled:
+            return
+        path = os.path.join(self.out_dir, "stages.json")
+        with open(path, "w") as f:
+            json.dump({"total_seconds": round(total_seconds, 3), "stages": self.stages}, f, indent=2)
+        print(f"Profile artifacts written to {self.out_dir}")
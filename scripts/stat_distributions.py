@@ -0,0 +1,85 @@
+"""
+Per-player stat distributions and line suggestions.
+
+For every player, stat and window (season, last 10, last 20 games) this computes
+the mean, p25 / median / p75 and the empirical hit rate at each STAT_THRESHOLDS
+rung, so consumers read a handful of numbers instead of the season's logs.
+Games are ranked by recency once per player, each window is a filter on that
+rank, and every statistic is a groupby over player_id for all stats at once.
+
+Missing stat values count as 0, the same as the season/L10 hit rates on streak
+rows. suggested_threshold is the highest rung hit in at least
+SUGGESTED_HIT_PCT percent of the window's games.
+"""
+
+import pandas as pd
+
+from refresh import STAT_COLUMNS, STAT_THRESHOLDS
+
+# Window label → most recent N games (None = whole season)
+DISTRIBUTION_WINDOWS = {
+    "season": None,
+    "l10": 10,
+    "l20": 20,
+}
+
+SUGGESTED_HIT_PCT = 70.0
+
+
+def calculate_stat_distributions(player_games: list[dict]) -> list[dict]:
+    """One row per player/stat/window: games, mean, quartiles, hit curve and suggested threshold."""
+    print("Calculating player stat distributions...")
+    if not player_games:
+        return []
+
+    columns = list(STAT_COLUMNS.values())
+    df = pd.DataFrame.from_records(
+        player_games, columns=["player_id", "player_name", "team_abbr", "game_date"] + columns
+    )
+    df[columns] = df[columns].apply(pd.to_numeric, errors="coerce").fillna(0)
+    # Name/team from each player's first record, as in group_player_games
+    players = df.groupby("player_id", sort=False)[["player_name", "team_abbr"]].first()
+    df = df.sort_values(["player_id", "game_date"], ascending=[True, False])
+    df["recency"] = df.groupby("player_id").cumcount()
+
+    rows = []
+    for window, last_n in DISTRIBUTION_WINDOWS.items():
+        games = df if last_n is None else df[df["recency"] < last_n]
+        by_player = games.groupby("player_id")
+        pids = by_player.size().index
+        counts = by_player.size().tolist()
+        names = players["player_name"].reindex(pids).tolist()
+        teams = players["team_abbr"].reindex(pids).tolist()
+        means = by_player[columns].mean().round(2)
+        quartiles = by_player[columns].quantile([0.25, 0.5, 0.75])          # (player, q) × stat
+
+        for stat_name, col in STAT_COLUMNS.items():
+            thresholds = STAT_THRESHOLDS.get(stat_name, [])
+            by_q = quartiles[col].unstack()
+            hits = pd.DataFrame(
+                {t: games[col] >= t for t in thresholds}, index=games.index
+            ).groupby(games["player_id"]).mean() * 100                         # player × threshold
+            hit_rows = hits.round(1).values.tolist()
+            stat_means = means[col].tolist()
+            p25, median, p75 = (by_q[q].tolist() for q in (0.25, 0.5, 0.75))
+
+            for i, pid in enumerate(pids.tolist()):
+                suggested = [t for t, pct in zip(thresholds, hit_rows[i]) if pct >= SUGGESTED_HIT_PCT]
+                rows.append({
+                    "player_id": pid,
+                    "player_name": names[i],
+                    "team_abbr": teams[i],
+                    "stat": stat_name,
+                    "games_window": window,
+                    "games": counts[i],
+                    "mean": stat_means[i],
+                    "p25": p25[i],
+                    "median": median[i],
+                    "p75": p75[i],
+                    "hit_pcts": dict(zip(map(str, thresholds), hit_rows[i])),
+                    "suggested_threshold": suggested[-1] if suggested else None,
+                    "sport": "NBA",
+                })
+
+    print(f"  {len(rows)} stat distribution rows")
+    return rows
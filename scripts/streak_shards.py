@@ -0,0 +1,112 @@
+"""
+Multi-process player streak computation.
+
+Players are partitioned by a stable hash of player_id into one shard per worker.
+The game data is packed once into a shared-memory int32 matrix (one row per game,
+players contiguous, most recent first) so workers read it in place instead of
+unpickling lists of dicts. Each worker runs refresh.calculate_player_streaks for
+its players, and results are merged back in the original player order, so the
+output is identical to the single-process calculate_streaks().
+"""
+
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from refresh import STAT_COLUMNS, calculate_player_streaks
+
+# Row layout: game_date as YYYYMMDD, then one column per STAT_COLUMNS entry
+GAME_COLUMNS = ["game_date"] + list(STAT_COLUMNS.values())
+
+# Sentinel for missing (None) stat values
+MISSING = -(2 ** 31)
+
+INT32_SIZE = 4
+
+
+def shard_for(player_id: int, workers: int) -> int:
+    """Stable shard assignment (independent of PYTHONHASHSEED and process)."""
+    return zlib.crc32(str(player_id).encode("ascii")) % workers
+
+
+def _encode_date(game_date: str) -> int:
+    return int(game_date[0:4]) * 10000 + int(game_date[5:7]) * 100 + int(game_date[8:10])
+
+
+def _decode_date(value: int) -> str:
+    return f"{value // 10000:04d}-{value // 100 % 100:02d}-{value % 100:02d}"
+
+
+def _compute_shard(shm_name: str, entries: list[tuple]) -> list[tuple[int, list[dict]]]:
+    """Worker: compute streaks for (player_id, name, team, row_offset, row_count) entries."""
+    # Pool workers share the parent's resource tracker, so attaching here does not take ownership
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        # The view must be released before close(), including on errors, or close()
+        # raises BufferError and hides the original exception
+        matrix = shm.buf.cast("i")
+        try:
+            width = len(GAME_COLUMNS)
+            results = []
+            for pid, player_name, team_abbr, offset, count in entries:
+                games = []
+                for row in range(offset, offset + count):
+                    base = row * width
+                    game = {"game_date": _decode_date(matrix[base])}
+                    for col_idx, col_name in enumerate(GAME_COLUMNS[1:], start=1):
+                        value = matrix[base + col_idx]
+                        game[col_name] = None if value == MISSING else value
+                    games.append(game)
+                results.append((pid, calculate_player_streaks(pid, player_name, team_abbr, games)))
+            return results
+        finally:
+            matrix.release()
+    finally:
+        shm.close()
+
+
+def calculate_streaks_sharded(player_data: dict, workers: int) -> list[dict]:
+    """Compute player streaks across `workers` processes.
+
+    player_data is calculate_streaks' grouping: pid → {player_name, team_abbr, games},
+    with each games list already sorted most recent first.
+    """
+    total_rows = sum(len(data["games"]) for data in player_data.values())
+    width = len(GAME_COLUMNS)
+    shm = shared_memory.SharedMemory(create=True, size=max(total_rows * width * INT32_SIZE, INT32_SIZE))
+    try:
+        matrix = shm.buf.cast("i")
+        try:
+            shards: list[list[tuple]] = [[] for _ in range(workers)]
+            row = 0
+            for pid, data in player_data.items():
+                games = data["games"]
+                for game in games:
+                    base = row * width
+                    matrix[base] = _encode_date(game["game_date"])
+                    for col_idx, col_name in enumerate(GAME_COLUMNS[1:], start=1):
+                        value = game.get(col_name)
+                        matrix[base + col_idx] = MISSING if value is None else int(value)
+                    row += 1
+                shards[shard_for(pid, workers)].append(
+                    (pid, data["player_name"], data["team_abbr"], row - len(games), len(games))
+                )
+        finally:
+            matrix.release()
+
+        by_player: dict[int, list[dict]] = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_compute_shard, shm.name, entries) for entries in shards if entries]
+            for future in futures:
+                by_player.update(future.result())
+    finally:
+        try:
+            shm.close()
+        finally:
+            shm.unlink()
+
+    # Deterministic merge: same player order as the single-process loop
+    streaks = []
+    for pid in player_data:
+        streaks.extend(by_player.get(pid, []))
+    return streaks
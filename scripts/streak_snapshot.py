@@ -0,0 +1,117 @@
+"""
+Local binary snapshot of the streaks the last run wrote, for event detection.
+
+detect_streak_events() only needs the previous run's streak keys, lengths and
+the few fields a "broke" event repeats. sync writes them here after replacing the
+streaks table, together with a checksum of the remote table (row count + latest
+updated_at, one tiny request). The next run re-probes that checksum: if it and
+the snapshot version match, it diffs against the snapshot instead of
+downloading the whole streaks table.
+
+File layout (little endian):
+    header   MAGIC, version u16, record count u32, string count u32, checksum length u16
+    checksum utf-8
+    strings  u16 length + utf-8 bytes each (names, abbreviations, stats, dates...)
+    records  RECORD each; string fields are indexes into the table, NONE for null
+"""
+
+import os
+import struct
+from typing import Optional
+
+MAGIC = b"BSSS"
+SNAPSHOT_VERSION = 1
+
+HEADER = struct.Struct("<4sHIIH")
+STRING_LEN = struct.Struct("<H")
+# player_id, player_name, team_abbr, stat, threshold, streak_type, entity_type, last_game, streak_len
+RECORD = struct.Struct("<qIIIdIIII")
+NONE = 0xFFFFFFFF
+
+STRING_FIELDS = ("player_name", "team_abbr", "stat", "streak_type", "entity_type", "last_game")
+
+
+def remote_checksum(supabase) -> str:
+    """Cheap fingerprint of the remote NBA streaks: row count and most recent updated_at."""
+    result = (
+        supabase.table("streaks")
+        .select("updated_at", count="exact")
+        .eq("sport", "NBA")
+        .order("updated_at", desc=True)
+        .limit(1)
+        .execute()
+    )
+    latest = result.data[0]["updated_at"] if result.data else ""
+    return f"{result.count}:{latest}"
+
+
+def save_snapshot(path: str, streaks: list[dict], checksum: str) -> None:
+    """Write streaks (streak rows as written to the streaks table) and the remote checksum."""
+    strings: dict[str, int] = {}
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        return strings.setdefault(value, len(strings))
+
+    records = bytearray()
+    for s in streaks:
+        records += RECORD.pack(
+            s["player_id"],
+            intern(s["player_name"]),
+            intern(s.get("team_abbr")),
+            intern(s["stat"]),
+            s["threshold"],
+            intern(s.get("streak_type") or "consecutive"),
+            intern(s["entity_type"]),
+            intern(s["last_game"]),
+            s["streak_len"],
+        )
+
+    checksum_bytes = checksum.encode("utf-8")
+    tmp_path = f"{path}.tmp"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(streaks), len(strings), len(checksum_bytes)))
+        f.write(checksum_bytes)
+        for value in strings:
+            encoded = value.encode("utf-8")
+            f.write(STRING_LEN.pack(len(encoded)))
+            f.write(encoded)
+        f.write(records)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str) -> Optional[tuple[str, list[dict]]]:
+    """Return (checksum, streak rows), or None if missing, truncated or another version."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, n_records, n_strings, checksum_len = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != SNAPSHOT_VERSION:
+            return None
+        offset = HEADER.size
+        checksum = data[offset:offset + checksum_len].decode("utf-8")
+        offset += checksum_len
+
+        strings = []
+        for _ in range(n_strings):
+            (length,) = STRING_LEN.unpack_from(data, offset)
+            offset += STRING_LEN.size
+            strings.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+        if len(data) != offset + n_records * RECORD.size:
+            return None
+
+        streaks = []
+        for fields in RECORD.iter_unpack(data[offset:]):
+            player_id, *indexes, streak_len = fields
+            threshold = indexes.pop(3)
+            row = {name: None if i == NONE else strings[i] for name, i in zip(STRING_FIELDS, indexes)}
+            row["player_id"] = player_id
+            row["threshold"] = int(threshold) if threshold.is_integer() else threshold
+            row["streak_len"] = streak_len
+            streaks.append(row)
+        return checksum, streaks
+    except (OSError, struct.error, UnicodeDecodeError, IndexError):
+        return None
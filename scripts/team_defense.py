@@ -0,0 +1,97 @@
+"""
+Opponent defensive context: what each team allows, precomputed from player logs.
+
+Every player game row is attributed to the opponent parsed from its matchup
+("LAL vs. BOS" → BOS), then one groupby over (opponent, game) sums what that
+defense allowed in each game. A second groupby over the opponent gives season
+and last-10 per-game averages, and ranks are taken over those columns. The
+result is one row per team, so reading a defense is a single-row lookup instead
+of a scan over the season's player_recent_games.
+
+Pass the whole league's logs (not the postseason-filtered ones): a defense's
+numbers must include every opponent it faced. Each team's games allowed is
+checked against the games it played itself.
+
+Ranks: 1 = allows the fewest per game (toughest defense for that stat).
+Trend: last-10 average minus season average (positive = allowing more lately).
+"""
+
+import pandas as pd
+
+from refresh import get_team_metadata
+
+# Stat label → player log column
+DEFENSE_STATS = {
+    "PTS": "pts",
+    "REB": "reb",
+    "AST": "ast",
+    "3PM": "fg3m",
+}
+
+RECENT_GAMES = 10
+
+
+def calculate_team_defense(player_games: list[dict]) -> list[dict]:
+    """Per-team allowed PTS/REB/AST/3PM per game (season and L10), trend and ranks."""
+    print("Calculating opponent defensive aggregates...")
+    columns = list(DEFENSE_STATS.values())
+    if not player_games:
+        return []
+
+    df = pd.DataFrame.from_records(
+        player_games, columns=["team_abbr", "game_id", "game_date", "matchup"] + columns
+    )
+    df["opp_abbr"] = df["matchup"].fillna("").str.extract(r"(?:vs\.|@) (\S+)$", expand=False)
+    df = df[df["opp_abbr"].notna()]
+
+    team_ids = {abbr: meta["id"] for abbr, meta in get_team_metadata().items()}
+    unknown = ~df["opp_abbr"].isin(list(team_ids))
+    if unknown.any():
+        print(f"  WARNING: skipping unknown opponent abbreviations: {sorted(df.loc[unknown, 'opp_abbr'].unique())}")
+        df = df[~unknown]
+
+    # Allowed per game: sum of every opposing player's line
+    allowed = (
+        df.groupby(["opp_abbr", "game_id"], sort=False)
+        .agg(game_date=("game_date", "first"), **{col: (col, "sum") for col in columns})
+        .reset_index()
+        .sort_values(["opp_abbr", "game_date"], ascending=[True, False])
+    )
+    allowed["recent"] = allowed.groupby("opp_abbr").cumcount() < RECENT_GAMES
+
+    by_team = allowed.groupby("opp_abbr")
+    season = by_team[columns].mean()
+    recent = allowed[allowed["recent"]].groupby("opp_abbr")[columns].mean()
+    summary = pd.DataFrame({
+        "games": by_team.size(),
+        "last_game": by_team["game_date"].max(),
+    })
+    # Every game a team played is a game its defense allowed something
+    played = df.groupby("team_abbr")["game_id"].nunique().reindex(summary.index, fill_value=0)
+    mismatched = summary.index[summary["games"] != played]
+    if len(mismatched):
+        details = ", ".join(f"{t} {summary.at[t, 'games']} allowed/{played[t]} played" for t in mismatched)
+        print(f"  WARNING: games allowed != games played for {len(mismatched)} teams ({details})")
+
+    for col in columns:
+        summary[f"{col}_allowed"] = season[col].round(1)
+        summary[f"{col}_allowed_l10"] = recent[col].round(1)
+        summary[f"{col}_allowed_trend"] = (recent[col] - season[col]).round(1)
+        summary[f"{col}_allowed_rank"] = season[col].rank(method="min").astype(int)
+        summary[f"{col}_allowed_l10_rank"] = recent[col].rank(method="min").astype(int)
+
+    rows = []
+    for team_abbr, values in summary.iterrows():
+        record = {
+            "team_id": team_ids[team_abbr],
+            "team_abbr": team_abbr,
+            "games": int(values["games"]),
+            "last_game": values["last_game"],
+        }
+        for key in summary.columns.drop(["games", "last_game"]):
+            record[key] = int(values[key]) if key.endswith("_rank") else float(values[key])
+        record["sport"] = "NBA"
+        rows.append(record)
+
+    print(f"  {len(rows)} team defense rows")
+    return rows
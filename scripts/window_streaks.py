@@ -0,0 +1,125 @@
+"""
+Rolling hit-window streaks: "at least X of the last Y games".
+
+A consecutive streak resets on a single miss; a window streak keeps going as long
+as every trailing Y-game window still has ≥ X hits. For each player/stat the
+games are laid out as one row of a (players × games) matrix, most recent first,
+and all thresholds are compared at once into a (players × thresholds × games)
+hit tensor. Window sums for every start position come from one cumulative sum
+along the games axis, and the streak length is the run of leading windows that
+satisfy the rule, so there is no per-window Python loop.
+
+Rows share the streaks table schema and are told apart by streak_type
+(e.g. "8of10"). streak_len counts the most recent games after which the rule
+held (rows start at MIN_STREAK_LENGTH, as for consecutive streaks);
+streak_win_pct is the hit rate of the current window.
+"""
+
+import numpy as np
+
+from refresh import MIN_STREAK_LENGTH, STAT_COLUMNS, STAT_THRESHOLDS, group_player_games
+
+# (min hits, window size) rules
+HIT_WINDOW_RULES = [
+    (8, 10),
+    (13, 15),
+]
+
+LAST_N = (5, 10, 15, 20)
+
+
+def window_streak_type(hits: int, window: int) -> str:
+    return f"{hits}of{window}"
+
+
+def _pct(hits: np.ndarray, games: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.round(hits / games * 100, 1)
+
+
+def calculate_window_streaks(player_games: list[dict]) -> list[dict]:
+    """Calculate "≥X of last Y" streaks for every player/stat/threshold and HIT_WINDOW_RULES entry."""
+    print("Calculating window streaks...")
+
+    player_data = group_player_games(player_games)
+    pids = list(player_data)
+    if not pids:
+        return []
+
+    n_players = len(pids)
+    n_games = np.array([len(player_data[pid]["games"]) for pid in pids])
+    max_games = int(n_games.max())
+    dates = [[g["game_date"] for g in player_data[pid]["games"]] for pid in pids]
+    positions = np.arange(max_games)
+    rows = np.arange(n_players)
+
+    # Stats × players × games, most recent first. Missing stats and padding are NaN,
+    # which never compare >= threshold (a miss)
+    columns = list(STAT_COLUMNS.values())
+    values = np.full((len(columns), n_players, max_games), np.nan)
+    for p, pid in enumerate(pids):
+        games = player_data[pid]["games"]
+        values[:, p, :len(games)] = np.array(
+            [[g.get(col) for col in columns] for g in games], dtype=float
+        ).T
+
+    streaks = []
+    for s, stat_name in enumerate(STAT_COLUMNS):
+        thresholds = np.array(STAT_THRESHOLDS.get(stat_name, []), dtype=float)
+        if not len(thresholds):
+            continue
+
+        hits = values[s, :, None, :] >= thresholds[None, :, None]      # P × T × G
+        cum = np.zeros((n_players, len(thresholds), max_games + 1), dtype=np.int32)
+        np.cumsum(hits, axis=2, out=cum[:, :, 1:])                       # P × T × (G+1)
+
+        season_wins = cum[rows, :, n_games]                               # P × T
+        season_pct = _pct(season_wins, n_games[:, None]).tolist()
+        season_wins = season_wins.tolist()
+        last_n = {}
+        for n in LAST_N:
+            games_n = np.minimum(n_games, n)
+            hits_n = cum[rows, :, games_n]
+            last_n[n] = (hits_n.tolist(), games_n.tolist(), _pct(hits_n, games_n[:, None]).tolist())
+
+        for min_hits, window in HIT_WINDOW_RULES:
+            if max_games < window:
+                continue
+            starts = max_games - window + 1
+            window_sums = cum[:, :, window:window + starts] - cum[:, :, :starts]   # P × T × starts
+            valid = positions[None, None, :starts] + window <= n_games[:, None, None]
+            ok = (window_sums >= min_hits) & valid
+            streak_len = np.cumprod(ok, axis=2).sum(axis=2)              # leading run of True
+            current_pct = _pct(window_sums[:, :, 0], window).tolist()
+
+            streak_type = window_streak_type(min_hits, window)
+            # Same minimum as consecutive streaks, so a rule met once doesn't emit a row
+            for p, t in zip(*np.nonzero(streak_len >= MIN_STREAK_LENGTH)):
+                pid = pids[p]
+                data = player_data[pid]
+                length = int(streak_len[p, t])
+                record = {
+                    "player_id": pid,
+                    "player_name": data["player_name"],
+                    "team_abbr": data["team_abbr"],
+                    "stat": stat_name,
+                    "threshold": int(thresholds[t]),
+                    "streak_type": streak_type,
+                    "streak_len": length,
+                    "streak_start": dates[p][length - 1],
+                    "streak_win_pct": current_pct[p][t],
+                    "season_wins": season_wins[p][t],
+                    "season_games": int(n_games[p]),
+                    "season_win_pct": season_pct[p][t],
+                    "last_game": dates[p][0],
+                }
+                for n, (hits_n, games_n, pct_n) in last_n.items():
+                    record[f"last{n}_hits"] = hits_n[p][t]
+                    record[f"last{n}_games"] = games_n[p]
+                    record[f"last{n}_hit_pct"] = pct_n[p][t]
+                record["sport"] = "NBA"
+                record["entity_type"] = "player"
+                streaks.append(record)
+
+    print(f"Found {len(streaks)} active window streaks")
+    return streaks
@@ -72,6 +72,7 @@ export function useAlerts(sportOverride?: SportKey) {
         .from("streak_events")
         .select("*")
         .eq("sport", sport)
+        .eq("streak_type", "consecutive")
         .order("created_at", { ascending: false })
         .limit(200);
 
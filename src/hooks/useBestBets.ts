@@ -172,6 +172,7 @@ export function useBestBets(filters: BestBetsFilters = DEFAULT_BEST_BETS_FILTERS
         .from("streaks")
         .select("*")
         .eq("sport", sport)
+        .eq("streak_type", "consecutive")
         .gte("streak_len", filters.minStreak)
         .gte("last_game", cutoffDate)
         .order("streak_len", { ascending: false });
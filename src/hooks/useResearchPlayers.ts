@@ -33,6 +33,7 @@ export function useResearchPlayers() {
           "player_id, player_name, team_abbr, stat, threshold, streak_len, season_win_pct, season_games, last10_hit_pct, last_game",
         )
         .eq("sport", sport)
+        .eq("streak_type", "consecutive")
         .eq("entity_type", "player")
         .order("streak_len", { ascending: false })
         .limit(2000);
@@ -89,6 +89,7 @@ export function useStreaks(filters: StreakFilters, sportOverride?: SportKey) {
         .from("streaks")
         .select("*")
         .eq("sport", sport)
+        .eq("streak_type", "consecutive")
         .eq("entity_type", filters.entityType)
         .gte("streak_len", filters.minStreak)
         .gte("season_win_pct", filters.minSeasonWinPct)
@@ -242,6 +243,7 @@ export function usePlayerStreaks(playerId: number) {
         .from("streaks")
         .select("*")
         .eq("player_id", playerId)
+        .eq("streak_type", "consecutive")
         .order("streak_len", { ascending: false })
         .order("season_win_pct", { ascending: false });
 
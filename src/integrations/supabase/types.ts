@@ -2058,6 +2058,162 @@ export type Database = {
         }
         Relationships: []
       }
+      player_split_streaks: {
+        Row: {
+          entity_type: string
+          id: string
+          last_game: string
+          last10_games: number | null
+          last10_hit_pct: number | null
+          last10_hits: number | null
+          last15_games: number | null
+          last15_hit_pct: number | null
+          last15_hits: number | null
+          last20_games: number | null
+          last20_hit_pct: number | null
+          last20_hits: number | null
+          last5_games: number | null
+          last5_hit_pct: number | null
+          last5_hits: number | null
+          player_id: number
+          player_name: string
+          season_games: number
+          season_win_pct: number
+          season_wins: number
+          split_type: string
+          split_value: string
+          sport: string
+          stat: string
+          streak_len: number
+          streak_start: string
+          streak_type: string
+          streak_win_pct: number
+          team_abbr: string | null
+          threshold: number
+          updated_at: string
+        }
+        Insert: {
+          entity_type?: string
+          id?: string
+          last_game: string
+          last10_games?: number | null
+          last10_hit_pct?: number | null
+          last10_hits?: number | null
+          last15_games?: number | null
+          last15_hit_pct?: number | null
+          last15_hits?: number | null
+          last20_games?: number | null
+          last20_hit_pct?: number | null
+          last20_hits?: number | null
+          last5_games?: number | null
+          last5_hit_pct?: number | null
+          last5_hits?: number | null
+          player_id: number
+          player_name: string
+          season_games: number
+          season_win_pct: number
+          season_wins: number
+          split_type: string
+          split_value: string
+          sport?: string
+          stat: string
+          streak_len: number
+          streak_start: string
+          streak_type?: string
+          streak_win_pct: number
+          team_abbr?: string | null
+          threshold: number
+          updated_at?: string
+        }
+        Update: {
+          entity_type?: string
+          id?: string
+          last_game?: string
+          last10_games?: number | null
+          last10_hit_pct?: number | null
+          last10_hits?: number | null
+          last15_games?: number | null
+          last15_hit_pct?: number | null
+          last15_hits?: number | null
+          last20_games?: number | null
+          last20_hit_pct?: number | null
+          last20_hits?: number | null
+          last5_games?: number | null
+          last5_hit_pct?: number | null
+          last5_hits?: number | null
+          player_id?: number
+          player_name?: string
+          season_games?: number
+          season_win_pct?: number
+          season_wins?: number
+          split_type?: string
+          split_value?: string
+          sport?: string
+          stat?: string
+          streak_len?: number
+          streak_start?: string
+          streak_type?: string
+          streak_win_pct?: number
+          team_abbr?: string | null
+          threshold?: number
+          updated_at?: string
+        }
+        Relationships: []
+      }
+      player_stat_distributions: {
+        Row: {
+          games: number
+          games_window: string
+          hit_pcts: Json
+          id: string
+          mean: number
+          median: number
+          p25: number
+          p75: number
+          player_id: number
+          player_name: string
+          sport: string
+          stat: string
+          suggested_threshold: number | null
+          team_abbr: string | null
+          updated_at: string
+        }
+        Insert: {
+          games: number
+          games_window: string
+          hit_pcts: Json
+          id?: string
+          mean: number
+          median: number
+          p25: number
+          p75: number
+          player_id: number
+          player_name: string
+          sport?: string
+          stat: string
+          suggested_threshold?: number | null
+          team_abbr?: string | null
+          updated_at?: string
+        }
+        Update: {
+          games?: number
+          games_window?: string
+          hit_pcts?: Json
+          id?: string
+          mean?: number
+          median?: number
+          p25?: number
+          p75?: number
+          player_id?: number
+          player_name?: string
+          sport?: string
+          stat?: string
+          suggested_threshold?: number | null
+          team_abbr?: string | null
+          updated_at?: string
+        }
+        Relationships: []
+      }
       players: {
         Row: {
           created_at: string
@@ -2427,6 +2583,7 @@ export type Database = {
         Row: {
           created_at: string
           entity_type: string
+          event_key: string
           event_type: string
           id: string
           last_game: string | null
@@ -2436,12 +2593,14 @@ export type Database = {
           prev_streak_len: number | null
           sport: string
           stat: string
+          streak_type: string
           team_abbr: string | null
           threshold: number
         }
         Insert: {
           created_at?: string
           entity_type: string
+          event_key: string
           event_type: string
           id?: string
           last_game?: string | null
@@ -2451,12 +2610,14 @@ export type Database = {
           prev_streak_len?: number | null
           sport?: string
           stat: string
+          streak_type?: string
           team_abbr?: string | null
           threshold: number
         }
         Update: {
           created_at?: string
           entity_type?: string
+          event_key?: string
           event_type?: string
           id?: string
           last_game?: string | null
@@ -2466,6 +2627,7 @@ export type Database = {
           prev_streak_len?: number | null
           sport?: string
           stat?: string
+          streak_type?: string
           team_abbr?: string | null
           threshold?: number
         }
@@ -2497,6 +2659,7 @@ export type Database = {
           stat: string
           streak_len: number
           streak_start: string
+          streak_type: string
           streak_win_pct: number
           team_abbr: string | null
           threshold: number
@@ -2527,6 +2690,7 @@ export type Database = {
           stat: string
           streak_len: number
           streak_start: string
+          streak_type?: string
           streak_win_pct: number
           team_abbr?: string | null
           threshold: number
@@ -2557,6 +2721,7 @@ export type Database = {
           stat?: string
           streak_len?: number
           streak_start?: string
+          streak_type?: string
           streak_win_pct?: number
           team_abbr?: string | null
           threshold?: number
@@ -2615,6 +2780,96 @@ export type Database = {
         }
         Relationships: []
       }
+      team_defense_allowed: {
+        Row: {
+          ast_allowed: number
+          ast_allowed_l10: number
+          ast_allowed_l10_rank: number
+          ast_allowed_rank: number
+          ast_allowed_trend: number
+          fg3m_allowed: number
+          fg3m_allowed_l10: number
+          fg3m_allowed_l10_rank: number
+          fg3m_allowed_rank: number
+          fg3m_allowed_trend: number
+          games: number
+          id: string
+          last_game: string
+          pts_allowed: number
+          pts_allowed_l10: number
+          pts_allowed_l10_rank: number
+          pts_allowed_rank: number
+          pts_allowed_trend: number
+          reb_allowed: number
+          reb_allowed_l10: number
+          reb_allowed_l10_rank: number
+          reb_allowed_rank: number
+          reb_allowed_trend: number
+          sport: string
+          team_abbr: string
+          team_id: number
+          updated_at: string
+        }
+        Insert: {
+          ast_allowed: number
+          ast_allowed_l10: number
+          ast_allowed_l10_rank: number
+          ast_allowed_rank: number
+          ast_allowed_trend: number
+          fg3m_allowed: number
+          fg3m_allowed_l10: number
+          fg3m_allowed_l10_rank: number
+          fg3m_allowed_rank: number
+          fg3m_allowed_trend: number
+          games: number
+          id?: string
+          last_game: string
+          pts_allowed: number
+          pts_allowed_l10: number
+          pts_allowed_l10_rank: number
+          pts_allowed_rank: number
+          pts_allowed_trend: number
+          reb_allowed: number
+          reb_allowed_l10: number
+          reb_allowed_l10_rank: number
+          reb_allowed_rank: number
+          reb_allowed_trend: number
+          sport?: string
+          team_abbr: string
+          team_id: number
+          updated_at?: string
+        }
+        Update: {
+          ast_allowed?: number
+          ast_allowed_l10?: number
+          ast_allowed_l10_rank?: number
+          ast_allowed_rank?: number
+          ast_allowed_trend?: number
+          fg3m_allowed?: number
+          fg3m_allowed_l10?: number
+          fg3m_allowed_l10_rank?: number
+          fg3m_allowed_rank?: number
+          fg3m_allowed_trend?: number
+          games?: number
+          id?: string
+          last_game?: string
+          pts_allowed?: number
+          pts_allowed_l10?: number
+          pts_allowed_l10_rank?: number
+          pts_allowed_rank?: number
+          pts_allowed_trend?: number
+          reb_allowed?: number
+          reb_allowed_l10?: number
+          reb_allowed_l10_rank?: number
+          reb_allowed_rank?: number
+          reb_allowed_trend?: number
+          sport?: string
+          team_abbr?: string
+          team_id?: number
+          updated_at?: string
+        }
+        Relationships: []
+      }
       team_recent_games: {
         Row: {
           game_date: string
@@ -267,7 +267,8 @@ export default function WatchlistPage() {
       const { data: allStreaks } = await supabase
         .from("streaks")
         .select("*")
-        .eq("sport", sport);
+        .eq("sport", sport)
+        .eq("streak_type", "consecutive");
 
       const streakMap = new Map<string, Streak>();
       for (const streak of (allStreaks || []) as Streak[]) {
@@ -0,0 +1,44 @@
+-- Player split streaks (home / away / vs tonight's opponent / rest-day buckets).
+-- Written by scripts/refresh.py: NBA rows are replaced on every refresh, same as public.streaks.
+CREATE TABLE public.player_split_streaks (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  sport text NOT NULL DEFAULT 'NBA',
+  entity_type text NOT NULL DEFAULT 'player',
+  player_id bigint NOT NULL,
+  player_name text NOT NULL,
+  team_abbr text,
+  split_type text NOT NULL CHECK (split_type IN ('home', 'away', 'opp', 'rest')),
+  split_value text NOT NULL,
+  stat text NOT NULL,
+  threshold numeric NOT NULL,
+  streak_len integer NOT NULL,
+  streak_start text NOT NULL,
+  streak_win_pct numeric NOT NULL,
+  season_wins integer NOT NULL,
+  season_games integer NOT NULL,
+  season_win_pct numeric NOT NULL,
+  last_game text NOT NULL,
+  last5_hits integer,
+  last5_games integer,
+  last5_hit_pct numeric,
+  last10_hits integer,
+  last10_games integer,
+  last10_hit_pct numeric,
+  last15_hits integer,
+  last15_games integer,
+  last15_hit_pct numeric,
+  last20_hits integer,
+  last20_games integer,
+  last20_hit_pct numeric,
+  updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+ALTER TABLE public.player_split_streaks ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "public read player split streaks"
+  ON public.player_split_streaks FOR SELECT
+  TO anon, authenticated
+  USING (true);
+
+CREATE INDEX idx_player_split_streaks_player ON public.player_split_streaks(sport, player_id);
+CREATE INDEX idx_player_split_streaks_split ON public.player_split_streaks(sport, split_type, split_value);
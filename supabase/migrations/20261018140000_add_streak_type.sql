@@ -0,0 +1,13 @@
+-- Streak family for streak rows and their events.
+-- 'consecutive' is the original definition (every one of the last N games hit);
+-- window streaks written by scripts/refresh.py use '<hits>of<window>' (e.g. '8of10').
+ALTER TABLE IF EXISTS public.streaks
+  ADD COLUMN IF NOT EXISTS streak_type text NOT NULL DEFAULT 'consecutive';
+
+ALTER TABLE IF EXISTS public.streak_events
+  ADD COLUMN IF NOT EXISTS streak_type text NOT NULL DEFAULT 'consecutive';
+
+ALTER TABLE IF EXISTS public.player_split_streaks
+  ADD COLUMN IF NOT EXISTS streak_type text NOT NULL DEFAULT 'consecutive';
+
+CREATE INDEX IF NOT EXISTS idx_streaks_sport_streak_type ON public.streaks(sport, streak_type);
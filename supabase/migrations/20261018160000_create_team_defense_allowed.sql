@@ -0,0 +1,40 @@
+-- Opponent defensive context: per-team allowed PTS/REB/AST/3PM per game.
+-- Written by scripts/refresh.py from player logs: NBA rows are replaced on every refresh.
+-- Ranks: 1 = allows the fewest per game. Trend = last-10 average minus season average.
+CREATE TABLE public.team_defense_allowed (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  sport text NOT NULL DEFAULT 'NBA',
+  team_id bigint NOT NULL,
+  team_abbr text NOT NULL,
+  games integer NOT NULL,
+  last_game text NOT NULL,
+  pts_allowed numeric NOT NULL,
+  pts_allowed_l10 numeric NOT NULL,
+  pts_allowed_trend numeric NOT NULL,
+  pts_allowed_rank integer NOT NULL,
+  pts_allowed_l10_rank integer NOT NULL,
+  reb_allowed numeric NOT NULL,
+  reb_allowed_l10 numeric NOT NULL,
+  reb_allowed_trend numeric NOT NULL,
+  reb_allowed_rank integer NOT NULL,
+  reb_allowed_l10_rank integer NOT NULL,
+  ast_allowed numeric NOT NULL,
+  ast_allowed_l10 numeric NOT NULL,
+  ast_allowed_trend numeric NOT NULL,
+  ast_allowed_rank integer NOT NULL,
+  ast_allowed_l10_rank integer NOT NULL,
+  fg3m_allowed numeric NOT NULL,
+  fg3m_allowed_l10 numeric NOT NULL,
+  fg3m_allowed_trend numeric NOT NULL,
+  fg3m_allowed_rank integer NOT NULL,
+  fg3m_allowed_l10_rank integer NOT NULL,
+  updated_at timestamptz NOT NULL DEFAULT now(),
+  UNIQUE (sport, team_abbr)
+);
+
+ALTER TABLE public.team_defense_allowed ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "public read team defense allowed"
+  ON public.team_defense_allowed FOR SELECT
+  TO anon, authenticated
+  USING (true);
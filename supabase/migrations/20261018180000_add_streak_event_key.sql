@@ -0,0 +1,35 @@
+-- Content-addressed streak events.
+-- scripts/refresh.py sets event_key = sha256 of
+--   sport|entity_type|entity|stat|threshold|streak_type|event_type|new_streak_len|last_game
+-- (entity = team_abbr for teams, player_id for players; see streak_event_key) and
+-- upserts with ON CONFLICT (event_key) DO NOTHING, so retried or overlapping runs
+-- cannot write the same event twice.
+ALTER TABLE public.streak_events
+  ADD COLUMN IF NOT EXISTS event_key text;
+
+-- Backfill existing rows with the same key the refresh script computes
+UPDATE public.streak_events
+SET event_key = encode(sha256(convert_to(concat_ws('|',
+      sport,
+      entity_type,
+      coalesce(CASE WHEN entity_type = 'team' THEN team_abbr ELSE player_id::text END, ''),
+      stat,
+      trim_scale(threshold::numeric)::text,
+      streak_type,
+      event_type,
+      coalesce(new_streak_len, 0)::text,
+      coalesce(last_game, '')
+    ), 'UTF8')), 'hex')
+WHERE event_key IS NULL;
+
+-- Drop duplicates already written by earlier retries (keep the first one)
+DELETE FROM public.streak_events e
+USING public.streak_events d
+WHERE e.event_key = d.event_key
+  AND (e.created_at, e.id) > (d.created_at, d.id);
+
+ALTER TABLE public.streak_events
+  ALTER COLUMN event_key SET NOT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS streak_events_event_key_key
+  ON public.streak_events(event_key);
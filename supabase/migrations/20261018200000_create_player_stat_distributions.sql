@@ -0,0 +1,29 @@
+-- Per-player stat distributions and line suggestions over season / last 10 / last 20 games.
+-- Written by scripts/refresh.py from player logs: NBA rows are replaced on every refresh.
+-- hit_pcts maps each threshold rung to the percent of games at or above it, e.g. {"10": 85.0, "15": 52.5}.
+-- suggested_threshold is the highest rung hit in at least 70% of the window's games.
+CREATE TABLE public.player_stat_distributions (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  sport text NOT NULL DEFAULT 'NBA',
+  player_id bigint NOT NULL,
+  player_name text NOT NULL,
+  team_abbr text,
+  stat text NOT NULL,
+  games_window text NOT NULL CHECK (games_window IN ('season', 'l10', 'l20')),
+  games integer NOT NULL,
+  mean numeric NOT NULL,
+  p25 numeric NOT NULL,
+  median numeric NOT NULL,
+  p75 numeric NOT NULL,
+  hit_pcts jsonb NOT NULL,
+  suggested_threshold numeric,
+  updated_at timestamptz NOT NULL DEFAULT now(),
+  UNIQUE (sport, player_id, stat, games_window)
+);
+
+ALTER TABLE public.player_stat_distributions ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "public read player stat distributions"
+  ON public.player_stat_distributions FOR SELECT
+  TO anon, authenticated
+  USING (true);